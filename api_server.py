@@ -1,23 +1,300 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from fairprop import FairHousingAuditor
-from typing import List, Optional
+from typing import Any, List, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import atexit
 import logging
-from datetime import datetime
+import mmap
+import os
+import queue
+import threading
+import time
 import json
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("fairprop.api")
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, preferring orjson."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def _loads(data: Any) -> Any:
+    """Parse JSON from bytes or str, preferring orjson."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+# Usage tracking
+usage_log_path = Path("logs/api_usage.jsonl")
+usage_log_path.parent.mkdir(exist_ok=True)
+
+class UsageLogWriter:
+    """
+    Appends usage entries to a JSONL file from a single background thread.
+
+    Request handlers only enqueue; the writer keeps one buffered handle open
+    and writes/flushes once per batch, so scans never wait on the filesystem.
+    When the queue is full, entries are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, path: Path, max_queue: int = 10000, batch_size: int = 256, flush_interval: float = 0.005):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the drain thread if it is not already running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="fairprop-usage-log", daemon=True)
+                self._thread.start()
+
+    def put(self, entry: dict):
+        """Queue an entry without blocking the caller."""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 1.0):
+        """Flush pending entries and stop the drain thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                logger.warning("Usage log queue full at shutdown, pending entries may be lost")
+            thread.join(timeout)
+
+    def _next_batch(self, first: dict) -> tuple:
+        """Collect up to `batch_size` entries or whatever arrives within `flush_interval`."""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _drain(self):
+        with open(self.path, 'ab', buffering=1 << 16) as f:
+            stop = False
+            while not stop:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                batch, stop = self._next_batch(entry)
+                try:
+                    f.write(b"".join(_dumps(e) + b"\n" for e in batch))
+                    f.flush()
+                except Exception as e:
+                    logger.error(f"Failed to log usage: {e}")
+
+usage_log = UsageLogWriter(usage_log_path)
+atexit.register(usage_log.close)
+
+class UsageStats:
+    """
+    Incremental counters over the usage log.
+
+    Only bytes appended since the last refresh are parsed, so /api/stats
+    stays cheap however large the log grows. Tailing the file (rather than
+    counting in-process) keeps totals correct when several workers share
+    one log. Counters and the file offset are snapshotted to `snapshot_path`
+    every `snapshot_every` entries so a restart only replays the tail.
+    """
+
+    def __init__(self, path: Path, snapshot_path: Path, snapshot_every: int = 1000):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.offset = 0
+        self.total_scans = 0
+        self.total_violations = 0
+        self._unsaved = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Restore counters from the last snapshot, if any."""
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        self._loaded = True
+        try:
+            snapshot = _loads(self.snapshot_path.read_bytes())
+            self.offset = int(snapshot["offset"])
+            self.total_scans = int(snapshot["total_scans"])
+            self.total_violations = int(snapshot["total_violations"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stats snapshot: {e}")
+            self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.total_scans = 0
+        self.total_violations = 0
+
+    def refresh(self) -> tuple:
+        """Count entries appended since the last refresh; return (scans, violations)."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return self.total_scans, self.total_violations
+            if size < self.offset:
+                # Log was truncated or rotated: recount from the start
+                self._reset()
+            if size == self.offset:
+                return self.total_scans, self.total_violations
+
+            with open(self.path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                # Leave a partially written last line for the next refresh
+                end = mm.rfind(b"\n", self.offset, size) + 1
+                if end <= self.offset:
+                    return self.total_scans, self.total_violations
+                data = mm[self.offset:end]
+
+            scans, violations = self._count(data)
+            self.total_scans += scans
+            self.total_violations += violations
+            self._unsaved += scans
+            self.offset = end
+
+            if self._unsaved >= self.snapshot_every:
+                self._save()
+            return self.total_scans, self.total_violations
+
+    @staticmethod
+    def _count(data: bytes) -> tuple:
+        """Count (scans, violations) in a block of complete log lines."""
+        # Entries written by UsageLogWriter are compact JSON with exactly one
+        # "is_safe" key per line, so C-level byte counts give the same result
+        # as parsing. A missing is_safe counts as safe, None as a violation.
+        lines = data.count(b"\n")
+        violations = data.count(b'"is_safe":false') + data.count(b'"is_safe":null')
+        if data.count(b'"is_safe":') == lines == violations + data.count(b'"is_safe":true'):
+            return lines, violations
+
+        # Foreign or malformed lines: parse line by line
+        scans = violations = 0
+        for line in data.splitlines():
+            if not line:
+                continue
+            try:
+                entry = _loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed usage log line")
+                continue
+            scans += 1
+            if not entry['response'].get('is_safe', True):
+                violations += 1
+        return scans, violations
+
+    def _save(self):
+        """Atomically write the counters and offset to the snapshot file."""
+        tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(_dumps({
+                "offset": self.offset,
+                "total_scans": self.total_scans,
+                "total_violations": self.total_violations
+            }))
+            os.replace(tmp_path, self.snapshot_path)
+            self._unsaved = 0
+        except Exception as e:
+            logger.error(f"Failed to save stats snapshot: {e}")
+
+usage_stats = UsageStats(usage_log_path, usage_log_path.parent / "stats.json")
+
+# Worker threads available to sync endpoints and batch items (anyio default: 40)
+THREADPOOL_SIZE = 200
+
+def _parse_warm_jurisdictions(value: str) -> List[tuple]:
+    """Parse "california;nyc;california,nyc" into jurisdiction sets."""
+    sets = []
+    for group in value.split(";"):
+        names = [name.strip() for name in group.split(",") if name.strip()]
+        if names:
+            sets.append(names)
+    return sets
+
+# Jurisdiction sets whose auditors are built at startup instead of on the
+# first request that uses them. Override with WARM_JURISDICTIONS.
+WARM_JURISDICTIONS = _parse_warm_jurisdictions(os.getenv("WARM_JURISDICTIONS", "california;nyc"))
+
+def _warm_auditors():
+    """Build auditors for WARM_JURISDICTIONS. Runs in a background thread."""
+    for jurisdictions in WARM_JURISDICTIONS:
+        try:
+            _get_auditor(_jurisdictions_key(jurisdictions))
+        except Exception as e:
+            logger.warning(f"Failed to warm auditor for {jurisdictions}: {e}")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Build the worker's auditors and start the usage log writer and stats tailer; flush on shutdown."""
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    usage_log.start()
+    await run_in_threadpool(get_default_auditor)
+    # Serving starts right away; requests for a set still warming just build it
+    threading.Thread(target=_warm_auditors, name="fairprop-warmup", daemon=True).start()
+    await run_in_threadpool(usage_stats.refresh)
+    yield
+    usage_log.close()
+
 app = FastAPI(
     title="FairProp Compliance API",
     description="REST API for Fair Housing Act compliance checking across 100+ global jurisdictions",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Enable CORS for browser extension
@@ -29,12 +306,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize auditor (singleton for performance)
-auditor = FairHousingAuditor()
+# Compress larger payloads (batch results repeat long suggestion/legal_basis strings)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Usage tracking
-usage_log_path = Path("logs/api_usage.jsonl")
-usage_log_path.parent.mkdir(exist_ok=True)
+# Default auditor, built lazily so each worker process creates its own
+# (the launcher process never pays for it)
+_default_auditor: Optional[FairHousingAuditor] = None
+_default_auditor_lock = threading.Lock()
+
+def get_default_auditor() -> FairHousingAuditor:
+    """Get this worker's federal-rules auditor (singleton for performance)."""
+    global _default_auditor
+    if _default_auditor is None:
+        with _default_auditor_lock:
+            if _default_auditor is None:
+                _default_auditor = FairHousingAuditor()
+    return _default_auditor
 
 class ScanRequest(BaseModel):
     text: str
@@ -55,10 +342,11 @@ class BatchScanResponse(BaseModel):
     total_violations: int
 
 def log_usage(endpoint: str, request_data: dict, response_data: dict):
-    """Log API usage for analytics (runs in background)."""
+    """Queue API usage for analytics (written by the background log writer)."""
     try:
         log_entry = {
-            "timestamp": datetime.now(datetime.UTC).isoformat(),
+            # Integer ms since the epoch: compact, sortable, cheap to produce
+            "ts": time.time_ns() // 1_000_000,
             "endpoint": endpoint,
             "request": request_data,
             "response": {
@@ -67,76 +355,151 @@ def log_usage(endpoint: str, request_data: dict, response_data: dict):
                 "violations_count": len(response_data.get("flagged_items", []))
             }
         }
-        with open(usage_log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        usage_log.put(log_entry)
     except Exception as e:
         logger.error(f"Failed to log usage: {e}")
 
-@app.post("/api/scan", response_model=ScanResponse)
-async def scan_text(request: ScanRequest, background_tasks: BackgroundTasks):
+def _jurisdictions_key(jurisdictions: List[str]) -> tuple:
+    """
+    Normalize a jurisdiction list so equivalent requests share one cache entry.
+    
+    Case and repeats are dropped, but order is kept: rules load in
+    jurisdiction order, which decides the order of flagged_items.
+    """
+    return tuple(dict.fromkeys(j.lower() for j in jurisdictions))
+
+@lru_cache(maxsize=128)
+def _get_auditor(jurisdictions_key: tuple) -> FairHousingAuditor:
+    """
+    Get the auditor for a normalized jurisdiction list.
+    
+    Jurisdiction-specific auditors are built once and reused, so requests
+    don't re-read and re-parse rule files on every call.
+    """
+    if not jurisdictions_key:
+        return get_default_auditor()
+    return FairHousingAuditor(jurisdictions=list(jurisdictions_key))
+
+def _scan_payload(report: dict) -> dict:
+    """Shape an auditor report like ScanResponse without re-validating it."""
+    return {
+        "score": report["score"],
+        "is_safe": report["is_safe"],
+        "flagged_items": report["flagged_items"]
+    }
+
+# Scan memo entries per worker, and the longest text memoized; the cache is
+# keyed on the text itself, so this caps it at 1000 * 4096 characters
+SCAN_CACHE_SIZE = 1000
+SCAN_CACHE_MAX_CHARS = 4096
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def _scan_cached(text: str, jurisdictions_key: tuple) -> dict:
+    """
+    Memoized scan for requests with use_cache enabled.
+    
+    Repeated (text, jurisdictions) requests skip the auditor entirely. The
+    auditor's own cache is bypassed so reports aren't held twice. Cached
+    reports are shared between requests and must not be mutated.
+    """
+    return _get_auditor(jurisdictions_key).scan_text(text, use_cache=False)
+
+def _scan_maybe_cached(text: str, jurisdictions_key: tuple) -> dict:
+    """Scan through _scan_cached, unless text is too long to keep."""
+    if len(text) <= SCAN_CACHE_MAX_CHARS:
+        return _scan_cached(text, jurisdictions_key)
+    return _get_auditor(jurisdictions_key).scan_text(text, use_cache=False)
+
+# Batch items sharing jurisdictions/use_cache are scanned in chunks of this
+# size, so one large group still spreads across threadpool workers
+BATCH_CHUNK_SIZE = 16
+
+def _scan_group(jurisdictions_key: tuple, use_cache: bool, texts: List[str]) -> List[dict]:
+    """Scan texts that share one auditor. Blocking: run it in the threadpool."""
+    if use_cache:
+        return [_scan_maybe_cached(text, jurisdictions_key) for text in texts]
+    return _get_auditor(jurisdictions_key).scan_texts(texts, use_cache=False)
+
+def _scan_item(item: ScanRequest) -> dict:
+    """Scan a single request item. Blocking: run it in the threadpool."""
+    jurisdictions_key = _jurisdictions_key(item.jurisdictions)
+    if item.use_cache:
+        return _scan_maybe_cached(item.text, jurisdictions_key)
+    return _get_auditor(jurisdictions_key).scan_text(item.text, use_cache=False)
+
+# Auditor output is trusted, so responses are returned as plain dicts rather
+# than re-validated through response_model; the models document the schema.
+@app.post("/api/scan", responses={200: {"model": ScanResponse}})
+def scan_text(request: ScanRequest):
     """
     Scan a single text for Fair Housing Act violations.
     
     Supports 100+ jurisdictions across 6 continents.
     Uses caching by default for improved performance.
+    Declared sync so FastAPI runs the CPU-bound scan in its threadpool
+    instead of blocking the event loop.
     """
     try:
-        if request.jurisdictions:
-            # Create jurisdiction-specific auditor
-            auditor_with_jurisdiction = FairHousingAuditor(jurisdictions=request.jurisdictions)
-            report = auditor_with_jurisdiction.scan_text(request.text, use_cache=request.use_cache)
-        else:
-            report = auditor.scan_text(request.text, use_cache=request.use_cache)
+        report = _scan_item(request)
         
-        # Log usage in background
-        background_tasks.add_task(
-            log_usage,
+        # Log usage (non-blocking, written by the background log writer)
+        log_usage(
             "/api/scan",
             {"jurisdictions": request.jurisdictions, "text_length": len(request.text)},
             report
         )
         
-        return ScanResponse(**report)
+        return FastJSONResponse(_scan_payload(report))
     except Exception as e:
         logger.error(f"Scan failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/scan/batch", response_model=BatchScanResponse)
-async def scan_batch(request: BatchScanRequest, background_tasks: BackgroundTasks):
+@app.post("/api/scan/batch", responses={200: {"model": BatchScanResponse}})
+async def scan_batch(request: BatchScanRequest):
     """
     Batch scan multiple texts for improved efficiency.
     
     Useful for processing large volumes of listings.
     Each item can have different jurisdictions.
+    Items are grouped by auditor and scanned in bulk, with chunks running
+    concurrently in the threadpool.
     """
     try:
-        results = []
-        total_violations = 0
+        groups = {}
+        for index, item in enumerate(request.items):
+            key = (_jurisdictions_key(item.jurisdictions), item.use_cache)
+            groups.setdefault(key, []).append(index)
+        
+        chunks = [
+            (key, indices[start:start + BATCH_CHUNK_SIZE])
+            for key, indices in groups.items()
+            for start in range(0, len(indices), BATCH_CHUNK_SIZE)
+        ]
+        chunk_reports = await asyncio.gather(*(
+            run_in_threadpool(_scan_group, *key, [request.items[i].text for i in indices])
+            for key, indices in chunks
+        ))
+        
+        reports = [None] * len(request.items)
+        for (_, indices), group_reports in zip(chunks, chunk_reports):
+            for index, report in zip(indices, group_reports):
+                reports[index] = report
         
-        for item in request.items:
-            if item.jurisdictions:
-                auditor_temp = FairHousingAuditor(jurisdictions=item.jurisdictions)
-                report = auditor_temp.scan_text(item.text, use_cache=item.use_cache)
-            else:
-                report = auditor.scan_text(item.text, use_cache=item.use_cache)
-            
-            results.append(ScanResponse(**report))
-            if not report['is_safe']:
-                total_violations += 1
+        results = [_scan_payload(report) for report in reports]
+        total_violations = sum(1 for report in reports if not report['is_safe'])
         
         # Log batch usage
-        background_tasks.add_task(
-            log_usage,
+        log_usage(
             "/api/scan/batch",
             {"batch_size": len(request.items)},
             {"total_violations": total_violations}
         )
         
-        return BatchScanResponse(
-            results=results,
-            total_scanned=len(results),
-            total_violations=total_violations
-        )
+        return FastJSONResponse({
+            "results": results,
+            "total_scanned": len(results),
+            "total_violations": total_violations
+        })
     except Exception as e:
         logger.error(f"Batch scan failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,7 +512,10 @@ async def reload_rules():
     Useful for updating rules in production without downtime.
     """
     try:
-        result = auditor.reload_rules()
+        result = get_default_auditor().reload_rules()
+        # Jurisdiction-specific auditors are rebuilt from disk on next use
+        _get_auditor.cache_clear()
+        _scan_cached.cache_clear()
         return {
             "status": "success",
             "message": f"Rules reloaded: {result['old_count']} → {result['new_count']}",
@@ -162,14 +528,14 @@ async def reload_rules():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint with system status."""
-    return {
+    return FastJSONResponse({
         "status": "healthy",
         "service": "FairProp API",
         "version": "2.0.0",
-        "ai_available": auditor.model_manager.has_ai,
-        "rules_loaded": len(auditor.rules),
+        "ai_available": get_default_auditor().model_manager.has_ai,
+        "rules_loaded": len(get_default_auditor().rules),
         "jurisdictions_supported": "100+"
-    }
+    })
 
 @app.get("/api/stats")
 async def get_stats():
@@ -178,15 +544,7 @@ async def get_stats():
         if not usage_log_path.exists():
             return {"total_scans": 0, "message": "No usage data yet"}
         
-        total_scans = 0
-        total_violations = 0
-        
-        with open(usage_log_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                entry = json.loads(line)
-                total_scans += 1
-                if not entry['response'].get('is_safe', True):
-                    total_violations += 1
+        total_scans, total_violations = await run_in_threadpool(usage_stats.refresh)
         
         return {
             "total_scans": total_scans,
@@ -200,7 +558,7 @@ async def get_stats():
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
+    return FastJSONResponse({
         "service": "FairProp Compliance API",
         "version": "2.0.0",
         "description": "Global fair housing compliance checking",
@@ -208,10 +566,22 @@ async def root():
         "docs": "/docs",
         "health": "/api/health",
         "stats": "/api/stats"
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting FairProp API server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # "auto" picks uvloop + httptools when uvicorn[standard] is installed and
+    # falls back to asyncio + h11 otherwise; an import string is required
+    # for uvicorn to spawn multiple workers.
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        # Each worker has its own auditor and scan caches
+        workers=max(2, (os.cpu_count() or 1) - 1),
+        log_level="warning"
+    )
 
@@ -1,4 +1,5 @@
 import streamlit as st
+import copy
 import json
 import os
 from datetime import datetime
@@ -65,13 +66,19 @@ def get_ai_fix(text):
         return f"AI Fix failed: {e}"
 
 # --- PDF Generation Helpers ---
-def create_pdf_certificate(text, report):
+@st.cache_resource
+def get_pdf_template():
+    """Certificate page with the static header drawn once; copied per download."""
     pdf = FPDF()
     pdf.add_page()
     
     # Header
     pdf.set_font("Helvetica", "B", 24)
     pdf.cell(0, 20, "FairProp Compliance Certificate", ln=True, align="C")
+    return pdf
+
+def create_pdf_certificate(text, report):
+    pdf = copy.deepcopy(get_pdf_template())
     pdf.set_font("Helvetica", "", 12)
     pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True, align="C")
     pdf.ln(10)
@@ -128,7 +135,7 @@ def create_pdf_certificate(text, report):
     pdf.set_text_color(128, 128, 128)
     pdf.cell(0, 10, "Audited by FairProp Open Source Engine", align="C")
     
-    return pdf.output()
+    return bytes(pdf.output())
 
 # --- UI Component Helpers ---
 def display_report(text, report):
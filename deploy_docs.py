@@ -1,11 +1,12 @@
 
+import asyncio
 import base64
-import json
-import urllib.request
-import urllib.error
+import importlib.util
 import sys
 import os
 
+import httpx
+
 TOKEN = os.environ.get("GITHUB_TOKEN")
 REPO_OWNER = "ZheWang-stack"
 REPO_NAME = "FairProp-AI"
@@ -18,54 +19,66 @@ HEADERS = {
     "User-Agent": "FairProp-Doc-Updater"
 }
 
-def call_api(url, data=None, method='GET'):
+# HTTP/2 needs the optional h2 package; otherwise connections are still pooled
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+async def call_api(client, url, data=None, method='GET'):
     try:
-        req = urllib.request.Request(
-            url, 
-            data=json.dumps(data).encode('utf-8') if data else None, 
-            headers=HEADERS, 
-            method=method
-        )
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.reason}")
+        resp = await client.request(method, url, json=data)
+        resp.raise_for_status()
+        return resp.json()
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP Error {e.response.status_code}: {e.response.reason_phrase}")
         return None
     except Exception as e:
         print(f"Unexpected error: {e}")
         return None
 
-def upload_file(filename):
-    print(f"Uploading {filename} to GitHub...")
+async def prepare_file(client, filename):
+    """Read a local file and fetch its current sha, if it exists on GitHub."""
     local_path = os.path.join(r"c:\Users\86187\Desktop\ease", filename)
     
     if not os.path.exists(local_path):
         print(f"Local file not found: {local_path}")
-        return
+        return None
 
     try:
         with open(local_path, "rb") as f:
             content = base64.b64encode(f.read()).decode("utf-8")
     except Exception as e:
         print(f"Error reading local file: {e}")
-        return
+        return None
     
     # Handle windows path separators for API
     api_path = filename.replace("\\", "/")
     url = f"{BASE_URL}/contents/{api_path}"
     
-    res = call_api(url)
+    res = await call_api(client, url)
     sha = res['sha'] if res and 'sha' in res else None
     
     data = {"message": f"Professionalize docs: {os.path.basename(filename)}", "content": content}
     if sha: data["sha"] = sha
-    
-    res = call_api(url, data=data, method='PUT')
+    return url, data
+
+async def upload_file(client, filename, prepared):
+    print(f"Uploading {filename} to GitHub...")
+    url, data = prepared
+    res = await call_api(client, url, data=data, method='PUT')
     if res:
         print(f"✅ {filename} uploaded successfully.")
     else:
         print(f"❌ Failed to upload {filename}.")
 
+async def upload_files(files):
+    async with httpx.AsyncClient(http2=HTTP2, headers=HEADERS, timeout=30) as client:
+        # Reads and sha lookups run concurrently over one pooled client
+        prepared = await asyncio.gather(*(prepare_file(client, f) for f in files))
+        # Each PUT commits to the branch head; GitHub rejects concurrent
+        # commits to the same branch with 409, so uploads stay sequential
+        for filename, item in zip(files, prepared):
+            if item:
+                await upload_file(client, filename, item)
+
 if __name__ == "__main__":
     files = [
         "README.md",
@@ -74,5 +87,4 @@ if __name__ == "__main__":
         "docs\\jurisdiction_coverage.md",
         "docs\\rules_engine.md"
     ]
-    for f in files:
-        upload_file(f)
+    asyncio.run(upload_files(files))
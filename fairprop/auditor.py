@@ -2,8 +2,10 @@ import json
 import re
 import os
 import logging
-import hashlib
-from typing import List, Dict, Any, Union, TypedDict
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union, TypedDict, NamedTuple
 from functools import lru_cache
 
 import difflib
@@ -13,6 +15,34 @@ try:
 except ImportError:
     HAS_THEFUZZ = False
 
+# Batched fuzzy scoring (thefuzz's own backend; cdist needs numpy)
+try:
+    import numpy
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Multi-pattern phrase matching (optional, x86 only)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Portable multi-pattern phrase matching (optional, any platform)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 # OCR
 try:
     import pytesseract
@@ -21,7 +51,8 @@ try:
 except ImportError:
     HAS_OCR = False
 
-from .models import ModelManager
+from . import disk_cache
+from .models import ModelManager, GUARDRAIL_BATCH_SIZE
 
 # Configure logging with more granular levels
 logging.basicConfig(
@@ -30,6 +61,273 @@ logging.basicConfig(
 )
 logger = logging.getLogger("fairprop.auditor")
 
+# Parsed rule files shared by all auditors: abs path -> ((mtime_ns, size), rules)
+_rules_file_cache: Dict[str, tuple] = {}
+_rules_file_lock = threading.Lock()
+
+def _read_rules_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Parse a rules JSON file, reusing the previous parse while it is unchanged.
+    
+    Auditors for different jurisdictions and rule reloads share this cache,
+    so a file is only re-parsed after its mtime or size changes. Callers
+    must not mutate the returned list.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _rules_file_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    rules = orjson.loads(data) if HAS_ORJSON else json.loads(data)  # pylint: disable=no-member
+    with _rules_file_lock:
+        _rules_file_cache[path] = (version, rules)
+    return rules
+
+_image_pool_lock = threading.Lock()
+_image_executor: Optional[ThreadPoolExecutor] = None
+
+def _image_pool() -> ThreadPoolExecutor:
+    """Threads running logo detection alongside OCR, started on first use."""
+    global _image_executor # pylint: disable=global-statement
+    with _image_pool_lock:
+        if _image_executor is None:
+            # OpenCV and Tesseract release the GIL, so the two overlap
+            _image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fairprop-logo")
+        return _image_executor
+
+class _KeywordMatchers(NamedTuple):
+    """Keyword-layer data compiled from one rule list."""
+    keyword_rules: list
+    trigger_rules: dict
+    rule_by_id: dict
+    flag_templates: dict
+    fuzzy_triggers: list
+    phrase_db: Any
+    phrases: list
+    phrase_scratch: threading.local
+    phrase_automaton: Any
+    phrase_regex: Any
+    implied_phrases: dict
+
+# Compiled keyword matchers shared by all auditors: rule key -> (rules, matchers)
+_MATCHER_CACHE_SIZE = 32
+_matcher_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_matcher_lock = threading.Lock()
+
+def _shared_matchers(rules: List[Dict[str, Any]], compile_matchers) -> _KeywordMatchers:
+    """
+    Keyword matchers for a rule list, compiled once per process.
+    
+    Rule files are parsed once (see _read_rules_file), so auditors for the
+    same jurisdictions, and reloads of unchanged files, see the very same
+    rule dicts. Keying on their identity and triggers lets those auditors
+    share one automaton instead of each compiling its own. The cached
+    entry holds the rules, so the ids in its key stay unique.
+    """
+    key = tuple((id(rule), tuple(rule["trigger_words"])) for rule in rules)
+    with _matcher_lock:
+        entry = _matcher_cache.get(key)
+        if entry is not None:
+            _matcher_cache.move_to_end(key)
+            return entry[1]
+    matchers = compile_matchers(rules)
+    with _matcher_lock:
+        _matcher_cache[key] = (rules, matchers)
+        while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matchers
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Build a regex matching the longest of `phrases` at the current position.
+    
+    Phrases sharing a prefix share one branch, so the regex engine only walks
+    branches that match the text instead of trying every phrase in turn.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer the longer phrase, fall back to this one
+        if terminal:
+            return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+        return body
+
+    return build(trie)
+
+# Bump when _trie_pattern's output changes, so cached patterns are rebuilt
+_TRIE_PATTERN_VERSION = b"trie-1"
+
+def _cached_trie_pattern(phrases: List[str]) -> str:
+    """_trie_pattern(phrases), reusing the result cached on disk for the same phrases."""
+    name = "trie-" + disk_cache.content_key(_TRIE_PATTERN_VERSION, *(p.encode('utf-8') for p in phrases)) + ".txt"
+    cached = disk_cache.read(name)
+    if cached is not None:
+        return cached.decode('utf-8')
+    pattern = _trie_pattern(phrases)
+    disk_cache.write(name, pattern.encode('utf-8'))
+    return pattern
+
+_WORD_RE = re.compile(r'\w+')
+# Same tokens as _WORD_RE on lowercased ASCII text, without Unicode
+# category lookups per character
+_ASCII_WORD_RE = re.compile(r'[a-z0-9_]+')
+# Runs of text between sentence delimiters: the non-empty pieces of re.split(r'[.!?\n]', text)
+_SENTENCE_RE = re.compile(r'[^.!?\n]+')
+
+# Rules for the countries built by scripts/generate_global_rules.py, keyed by country
+_COUNTRY_INDEX = 'rules/international/index.json'
+# Rules for the states built by scripts/generate_state_rules.py, keyed by state
+_STATE_INDEX = 'rules/us_states/index.json'
+
+# Jurisdiction name -> rules file, or (index file, key) for rules kept in an
+# index; paths are relative to the federal rules file's directory
+_JURISDICTION_MAP = {
+    # US State/City - Major jurisdictions
+    'california': 'rules/california_feha.json',
+    'nyc': 'rules/nyc_hrl.json',
+    'new_york_city': 'rules/nyc_hrl.json',
+    
+    # All 50 US States + DC (auto-generated)
+    'alabama': (_STATE_INDEX, 'alabama'),
+    'alaska': (_STATE_INDEX, 'alaska'),
+    'arizona': (_STATE_INDEX, 'arizona'),
+    'arkansas': (_STATE_INDEX, 'arkansas'),
+    'colorado': (_STATE_INDEX, 'colorado'),
+    'connecticut': (_STATE_INDEX, 'connecticut'),
+    'delaware': (_STATE_INDEX, 'delaware'),
+    'dc': 'rules/us_states/dc.json',
+    'washington_dc': 'rules/us_states/dc.json',
+    'florida': (_STATE_INDEX, 'florida'),
+    'georgia': (_STATE_INDEX, 'georgia'),
+    'hawaii': (_STATE_INDEX, 'hawaii'),
+    'idaho': (_STATE_INDEX, 'idaho'),
+    'illinois': (_STATE_INDEX, 'illinois'),
+    'indiana': (_STATE_INDEX, 'indiana'),
+    'iowa': (_STATE_INDEX, 'iowa'),
+    'kansas': (_STATE_INDEX, 'kansas'),
+    'kentucky': (_STATE_INDEX, 'kentucky'),
+    'louisiana': (_STATE_INDEX, 'louisiana'),
+    'maine': (_STATE_INDEX, 'maine'),
+    'maryland': (_STATE_INDEX, 'maryland'),
+    'massachusetts': (_STATE_INDEX, 'massachusetts'),
+    'michigan': (_STATE_INDEX, 'michigan'),
+    'minnesota': (_STATE_INDEX, 'minnesota'),
+    'mississippi': (_STATE_INDEX, 'mississippi'),
+    'missouri': (_STATE_INDEX, 'missouri'),
+    'montana': (_STATE_INDEX, 'montana'),
+    'nebraska': (_STATE_INDEX, 'nebraska'),
+    'nevada': (_STATE_INDEX, 'nevada'),
+    'new_hampshire': (_STATE_INDEX, 'new_hampshire'),
+    'new_jersey': (_STATE_INDEX, 'new_jersey'),
+    'new_mexico': (_STATE_INDEX, 'new_mexico'),
+    'new_york': (_STATE_INDEX, 'new_york'),
+    'north_carolina': (_STATE_INDEX, 'north_carolina'),
+    'north_dakota': (_STATE_INDEX, 'north_dakota'),
+    'ohio': (_STATE_INDEX, 'ohio'),
+    'oklahoma': (_STATE_INDEX, 'oklahoma'),
+    'oregon': (_STATE_INDEX, 'oregon'),
+    'pennsylvania': (_STATE_INDEX, 'pennsylvania'),
+    'rhode_island': (_STATE_INDEX, 'rhode_island'),
+    'south_carolina': (_STATE_INDEX, 'south_carolina'),
+    'south_dakota': (_STATE_INDEX, 'south_dakota'),
+    'tennessee': (_STATE_INDEX, 'tennessee'),
+    'texas': (_STATE_INDEX, 'texas'),
+    'utah': (_STATE_INDEX, 'utah'),
+    'vermont': (_STATE_INDEX, 'vermont'),
+    'virginia': (_STATE_INDEX, 'virginia'),
+    'washington': (_STATE_INDEX, 'washington'),
+    'west_virginia': (_STATE_INDEX, 'west_virginia'),
+    'wisconsin': (_STATE_INDEX, 'wisconsin'),
+    'wyoming': (_STATE_INDEX, 'wyoming'),
+    
+    # International - Countries
+    'canada': 'rules/international/canada.json',
+    'australia': 'rules/international/australia.json',
+    'uk': 'rules/international/uk.json',
+    'united_kingdom': 'rules/international/uk.json',
+    'singapore': 'rules/international/asia_pacific.json',
+    'hong_kong': 'rules/international/asia_pacific.json',
+    'japan': 'rules/international/asia_pacific.json',
+    'asia_pacific': 'rules/international/asia_pacific.json',
+    
+    # European Union
+    'germany': 'rules/international/germany.json',
+    'deutschland': 'rules/international/germany.json',
+    'france': 'rules/international/france.json',
+    'netherlands': 'rules/international/netherlands.json',
+    'nederland': 'rules/international/netherlands.json',
+    
+    # Europe (Additional)
+    'spain': (_COUNTRY_INDEX, 'spain'),
+    'italy': (_COUNTRY_INDEX, 'italy'),
+    'portugal': (_COUNTRY_INDEX, 'portugal'),
+    'poland': (_COUNTRY_INDEX, 'poland'),
+    'sweden': (_COUNTRY_INDEX, 'sweden'),
+    'norway': (_COUNTRY_INDEX, 'norway'),
+    'denmark': (_COUNTRY_INDEX, 'denmark'),
+    'finland': (_COUNTRY_INDEX, 'finland'),
+    'belgium': (_COUNTRY_INDEX, 'belgium'),
+    'austria': (_COUNTRY_INDEX, 'austria'),
+    'switzerland': (_COUNTRY_INDEX, 'switzerland'),
+    'ireland': (_COUNTRY_INDEX, 'ireland'),
+    'greece': (_COUNTRY_INDEX, 'greece'),
+    'czech_republic': (_COUNTRY_INDEX, 'czech_republic'),
+    
+    # Asia
+    'china': (_COUNTRY_INDEX, 'china'),
+    'india': (_COUNTRY_INDEX, 'india'),
+    'south_korea': (_COUNTRY_INDEX, 'south_korea'),
+    'korea': (_COUNTRY_INDEX, 'south_korea'),
+    'thailand': (_COUNTRY_INDEX, 'thailand'),
+    'vietnam': (_COUNTRY_INDEX, 'vietnam'),
+    'indonesia': (_COUNTRY_INDEX, 'indonesia'),
+    'malaysia': (_COUNTRY_INDEX, 'malaysia'),
+    'philippines': (_COUNTRY_INDEX, 'philippines'),
+    'taiwan': (_COUNTRY_INDEX, 'taiwan'),
+    
+    # Middle East
+    'uae': (_COUNTRY_INDEX, 'uae'),
+    'saudi_arabia': (_COUNTRY_INDEX, 'saudi_arabia'),
+    'israel': (_COUNTRY_INDEX, 'israel'),
+    'turkey': (_COUNTRY_INDEX, 'turkey'),
+    
+    # Africa
+    'south_africa': (_COUNTRY_INDEX, 'south_africa'),
+    'nigeria': (_COUNTRY_INDEX, 'nigeria'),
+    'kenya': (_COUNTRY_INDEX, 'kenya'),
+    'egypt': (_COUNTRY_INDEX, 'egypt'),
+    'morocco': (_COUNTRY_INDEX, 'morocco'),
+    
+    # Latin America
+    'brazil': 'rules/international/brazil.json',
+    'brasil': 'rules/international/brazil.json',
+    'mexico': 'rules/international/mexico.json',
+    'méxico': 'rules/international/mexico.json',
+    'argentina': (_COUNTRY_INDEX, 'argentina'),
+    'chile': (_COUNTRY_INDEX, 'chile'),
+    'colombia': (_COUNTRY_INDEX, 'colombia'),
+    'peru': (_COUNTRY_INDEX, 'peru'),
+    'costa_rica': (_COUNTRY_INDEX, 'costa_rica'),
+    'panama': (_COUNTRY_INDEX, 'panama'),
+    
+    # Oceania
+    'new_zealand': (_COUNTRY_INDEX, 'new_zealand'),
+}
+
 class FlaggedItem(TypedDict):
     id: str
     category: str
@@ -98,7 +396,7 @@ class FairHousingAuditor:
         # This creates the vector database for semantic search
         if self.model_manager.has_ai:
             logger.debug("AI engines available, initializing vector database...")
-            _ = self.model_manager.get_collection(self.rules)
+            _ = self.model_manager.get_rule_index(self.rules) or self.model_manager.get_collection(self.rules)
         else:
             logger.info("Running in rule-only mode (AI dependencies not found)")
     
@@ -119,11 +417,252 @@ class FairHousingAuditor:
             logger.info("Re-indexing rules into vector database...")
             # Force recreation of collection
             self.model_manager.reset_collection()
-            _ = self.model_manager.get_collection(self.rules)
+            _ = self.model_manager.get_rule_index(self.rules) or self.model_manager.get_collection(self.rules)
         
         logger.info("Rules reloaded: %s -> %s rules", old_count, new_count)
         return {"old_count": old_count, "new_count": new_count}
 
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        """Loaded rules. Assigning new rules rebuilds the keyword matchers."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[Dict[str, Any]]):
+        self._rules = rules
+        matchers = _shared_matchers(rules, self._compile_matchers)
+        self._keyword_rules = matchers.keyword_rules
+        self._trigger_rules = matchers.trigger_rules
+        self._rule_by_id = matchers.rule_by_id
+        self._flag_templates = matchers.flag_templates
+        self._fuzzy_triggers = matchers.fuzzy_triggers
+        self._phrase_db, self._phrases = matchers.phrase_db, matchers.phrases
+        self._phrase_scratch = matchers.phrase_scratch
+        self._phrase_automaton = matchers.phrase_automaton
+        self._phrase_regex, self._implied_phrases = matchers.phrase_regex, matchers.implied_phrases
+
+    @classmethod
+    def _compile_matchers(cls, rules: List[Dict[str, Any]]) -> _KeywordMatchers:
+        """Compile the keyword-layer matchers for a rule list."""
+        keyword_rules = cls._prepare_keyword_rules(rules)
+        # Lowered trigger -> (rule index, trigger position, fuzzy eligible) of each use
+        trigger_rules = {}
+        for rule_index, (_, triggers) in enumerate(keyword_rules):
+            for position, (_, trigger_lower, fuzzy) in enumerate(triggers):
+                trigger_rules.setdefault(trigger_lower, []).append((rule_index, position, fuzzy))
+        rule_by_id = {}
+        for rule in rules:
+            # First rule wins when jurisdictions reuse an id
+            rule_by_id.setdefault(rule["id"], rule)
+        # Keyed on identity: rules sharing an id may differ. The matchers
+        # hold the rules, so their ids stay unique while this is alive.
+        flag_templates = {id(rule): cls._flag_template(rule) for rule in rules}
+        fuzzy_triggers = sorted({t[1] for _, triggers in keyword_rules for t in triggers if t[2]})
+        phrase_db, phrases = cls._compile_phrase_db(keyword_rules)
+        phrase_automaton = None if phrase_db is not None else cls._compile_phrase_automaton(keyword_rules)
+        if phrase_db is None and phrase_automaton is None:
+            phrase_regex, implied_phrases = cls._compile_phrase_regex(keyword_rules)
+        else:
+            phrase_regex, implied_phrases = None, {}
+        return _KeywordMatchers(
+            keyword_rules, trigger_rules, rule_by_id, flag_templates, fuzzy_triggers, phrase_db, phrases,
+            threading.local(), phrase_automaton, phrase_regex, implied_phrases
+        )
+
+    @staticmethod
+    def _compile_phrase_automaton(keyword_rules: list):
+        """
+        Build an Aho-Corasick automaton over every trigger.
+        
+        Used when Hyperscan is unavailable: one linear pass over the text
+        reports every trigger occurrence, overlapping ones included.
+        Returns None when pyahocorasick is missing or there are no triggers.
+        """
+        if not HAS_AHOCORASICK:
+            return None
+        phrases = {t[1] for _, triggers in keyword_rules for t in triggers if t[1]}
+        if not phrases:
+            return None
+        automaton = ahocorasick.Automaton()
+        for phrase in phrases:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _compile_phrase_regex(keyword_rules: list):
+        """
+        Compile every trigger into one trie-shaped regex.
+        
+        The regex finds, at each text position, the longest trigger starting
+        there; `implied` maps that trigger to every trigger that is a prefix
+        of it. Together they give exactly the set of triggers that occur as
+        substrings, from a single C-level pass over the text.
+        Returns (regex, implied), with a None regex if compilation fails.
+        """
+        phrases = sorted({t[1] for _, triggers in keyword_rules for t in triggers if t[1]})
+        if not phrases:
+            return None, {}
+        phrase_set = set(phrases)
+        implied = {
+            p: {p[:i] for i in range(1, len(p) + 1) if p[:i] in phrase_set}
+            for p in phrases
+        }
+        try:
+            return re.compile(f"(?=({_cached_trie_pattern(phrases)}))"), implied
+        except (re.error, RecursionError) as e:
+            logger.warning("Combined trigger regex failed to compile, using substring matching: %s", e)
+            return None, {}
+
+    @classmethod
+    def _compile_phrase_db(cls, keyword_rules: list):
+        """
+        Compile every trigger into one Hyperscan database.
+        
+        With Hyperscan available, a single pass over the text reports all
+        triggers it contains, instead of one substring search per trigger.
+        Returns (database, phrases by pattern id), with a None database when
+        Hyperscan is missing or compilation fails.
+        """
+        if not HAS_HYPERSCAN:
+            return None, []
+        # Empty triggers match everything and are handled in _matched_phrases
+        phrases = sorted({t[1] for _, triggers in keyword_rules for t in triggers if t[1]})
+        if not phrases:
+            return None, []
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[cls._literal_pattern(p) for p in phrases],
+                ids=list(range(len(phrases))),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(phrases)
+            )
+            return db, phrases
+        except Exception as e:
+            logger.warning("Hyperscan compilation failed, using substring matching: %s", e)
+            return None, []
+
+    @staticmethod
+    def _literal_pattern(phrase: str) -> bytes:
+        """Escape a phrase so Hyperscan matches its UTF-8 bytes literally."""
+        return b"".join(
+            bytes([b]) if chr(b).isalnum() and b < 128 else b"\\x%02x" % b
+            for b in phrase.encode('utf-8')
+        )
+
+    def _matched_phrases(self, text_lower: str):
+        """Set of lowered triggers found in the text, or None if no matcher compiled."""
+        if self._phrase_db is None:
+            if self._phrase_automaton is not None:
+                found = {""}
+                found.update(phrase for _, phrase in self._phrase_automaton.iter(text_lower))
+                return found
+            if self._phrase_regex is None:
+                return None
+            found = {""}
+            implied = self._implied_phrases
+            for match in self._phrase_regex.finditer(text_lower):
+                found |= implied[match.group(1)]
+            return found
+        scratch = getattr(self._phrase_scratch, "scratch", None)
+        if scratch is None:
+            # Scratch space is per-thread; the database itself is shared
+            scratch = hyperscan.Scratch(self._phrase_db)
+            self._phrase_scratch.scratch = scratch
+        
+        found = {""}
+        phrases = self._phrases
+        
+        def on_match(pattern_id, _start, _end, _flags, _context):
+            found.add(phrases[pattern_id])
+        
+        self._phrase_db.scan(text_lower.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        return found
+
+    def _flags_from_hits(self, matched_phrases: set, fuzzy_hits: dict):
+        """
+        Keyword-layer flags and flagged rule ids, visiting only rules with a hit.
+        
+        Equivalent to checking every trigger of every rule in order: each
+        rule is flagged on its first matching trigger, a phrase match going
+        before a fuzzy match of the same trigger, and a rule id is flagged
+        once, by the first such rule. Work scales with the hits rather
+        than with the total number of triggers.
+        """
+        trigger_rules = self._trigger_rules
+        # rule index -> (trigger position, 0 phrase / 1 fuzzy, fuzzy word)
+        first_hits = {}
+        for phrase in matched_phrases:
+            for rule_index, position, _ in trigger_rules.get(phrase, ()):
+                hit = (position, 0, None)
+                if rule_index not in first_hits or hit < first_hits[rule_index]:
+                    first_hits[rule_index] = hit
+        for trigger_lower, word in fuzzy_hits.items():
+            for rule_index, position, fuzzy in trigger_rules[trigger_lower]:
+                current = first_hits.get(rule_index)
+                if fuzzy and (current is None or position < current[0]):
+                    first_hits[rule_index] = (position, 1, word)
+        
+        flagged_items = []
+        flagged_rule_ids = set()
+        keyword_rules = self._keyword_rules
+        for rule_index in sorted(first_hits):
+            rule, triggers = keyword_rules[rule_index]
+            if rule["id"] in flagged_rule_ids: continue
+            position, kind, word = first_hits[rule_index]
+            trigger = triggers[position][0]
+            flagged_items.append(self._create_flag(rule, trigger, trigger if kind == 0 else word))
+            flagged_rule_ids.add(rule["id"])
+        return flagged_items, flagged_rule_ids
+
+    def _fuzzy_hits(self, words: List[str]):
+        """
+        First word fuzzily matching each single-word trigger, or None without rapidfuzz.
+        
+        All trigger x word similarities are scored in one rapidfuzz cdist
+        call; pairs scoring near the threshold are then confirmed with
+        _fuzzy_match, so results are identical to checking pairs one by one.
+        """
+        if not HAS_RAPIDFUZZ:
+            return None
+        triggers = self._fuzzy_triggers
+        if not words or not triggers:
+            return {}
+        # One point below the threshold: thefuzz rounds scores before comparing.
+        # The matrix only feeds nonzero() and the cutoff applies before
+        # rounding, so uint8 scores (a quarter of float32) are enough
+        scores = rapid_process.cdist(
+            triggers, words, scorer=rapid_fuzz.ratio,
+            score_cutoff=self.fuzz_threshold * 100 - 1, dtype=numpy.uint8
+        )
+        hits = {}
+        # nonzero() is row-major, so each trigger's candidates come in word order
+        for row, col in zip(*scores.nonzero()):
+            trigger = triggers[row]
+            if trigger not in hits and self._fuzzy_match(trigger, words[col]):
+                hits[trigger] = words[col]
+        return hits
+
+    @staticmethod
+    def _prepare_keyword_rules(rules: List[Dict[str, Any]]) -> list:
+        """
+        Precompute per-rule trigger data for the keyword layer.
+        
+        Lowercasing triggers and deciding which are eligible for fuzzy
+        matching is done once per rule load instead of once per scan.
+        Each entry is (rule, [(trigger, trigger_lower, fuzzy_eligible), ...]).
+        """
+        prepared = []
+        for rule in rules:
+            triggers = []
+            for trigger in rule["trigger_words"]:
+                trigger_lower = trigger.lower()
+                # Same eligibility as _fuzzy_match: single words of 4+ chars
+                fuzzy = ' ' not in trigger_lower and len(trigger_lower) >= 4
+                triggers.append((trigger, trigger_lower, fuzzy))
+            prepared.append((rule, triggers))
+        return prepared
+
     def _load_rules(self) -> List[Dict[str, Any]]:
         """Loads FHA rules from the JSON configuration and merges jurisdiction-specific rules."""
         if not os.path.exists(self.rules_path):
@@ -136,167 +675,39 @@ class FairHousingAuditor:
                 raise FileNotFoundError(f"Rules database not found at {self.rules_path}")
         
         try:
-            with open(self.rules_path, 'r', encoding='utf-8') as f:
-                federal_rules = json.load(f)
+            federal_rules = _read_rules_file(self.rules_path)
         except json.JSONDecodeError as e:
             logger.error("Error parsing rules file: %s", e)
             raise ValueError(f"Error parsing rules file: {e}") from e
         
         # Load jurisdiction-specific rules
         all_rules = federal_rules.copy()
-        
-        # Comprehensive jurisdiction mapping
-        jurisdiction_map = {
-            # US State/City - Major jurisdictions
-            'california': 'rules/california_feha.json',
-            'nyc': 'rules/nyc_hrl.json',
-            'new_york_city': 'rules/nyc_hrl.json',
-            
-            # All 50 US States + DC (auto-generated)
-            'alabama': 'rules/us_states/alabama.json',
-            'alaska': 'rules/us_states/alaska.json',
-            'arizona': 'rules/us_states/arizona.json',
-            'arkansas': 'rules/us_states/arkansas.json',
-            'colorado': 'rules/us_states/colorado.json',
-            'connecticut': 'rules/us_states/connecticut.json',
-            'delaware': 'rules/us_states/delaware.json',
-            'dc': 'rules/us_states/dc.json',
-            'washington_dc': 'rules/us_states/dc.json',
-            'florida': 'rules/us_states/florida.json',
-            'georgia': 'rules/us_states/georgia.json',
-            'hawaii': 'rules/us_states/hawaii.json',
-            'idaho': 'rules/us_states/idaho.json',
-            'illinois': 'rules/us_states/illinois.json',
-            'indiana': 'rules/us_states/indiana.json',
-            'iowa': 'rules/us_states/iowa.json',
-            'kansas': 'rules/us_states/kansas.json',
-            'kentucky': 'rules/us_states/kentucky.json',
-            'louisiana': 'rules/us_states/louisiana.json',
-            'maine': 'rules/us_states/maine.json',
-            'maryland': 'rules/us_states/maryland.json',
-            'massachusetts': 'rules/us_states/massachusetts.json',
-            'michigan': 'rules/us_states/michigan.json',
-            'minnesota': 'rules/us_states/minnesota.json',
-            'mississippi': 'rules/us_states/mississippi.json',
-            'missouri': 'rules/us_states/missouri.json',
-            'montana': 'rules/us_states/montana.json',
-            'nebraska': 'rules/us_states/nebraska.json',
-            'nevada': 'rules/us_states/nevada.json',
-            'new_hampshire': 'rules/us_states/new_hampshire.json',
-            'new_jersey': 'rules/us_states/new_jersey.json',
-            'new_mexico': 'rules/us_states/new_mexico.json',
-            'new_york': 'rules/us_states/new_york.json',
-            'north_carolina': 'rules/us_states/north_carolina.json',
-            'north_dakota': 'rules/us_states/north_dakota.json',
-            'ohio': 'rules/us_states/ohio.json',
-            'oklahoma': 'rules/us_states/oklahoma.json',
-            'oregon': 'rules/us_states/oregon.json',
-            'pennsylvania': 'rules/us_states/pennsylvania.json',
-            'rhode_island': 'rules/us_states/rhode_island.json',
-            'south_carolina': 'rules/us_states/south_carolina.json',
-            'south_dakota': 'rules/us_states/south_dakota.json',
-            'tennessee': 'rules/us_states/tennessee.json',
-            'texas': 'rules/us_states/texas.json',
-            'utah': 'rules/us_states/utah.json',
-            'vermont': 'rules/us_states/vermont.json',
-            'virginia': 'rules/us_states/virginia.json',
-            'washington': 'rules/us_states/washington.json',
-            'west_virginia': 'rules/us_states/west_virginia.json',
-            'wisconsin': 'rules/us_states/wisconsin.json',
-            'wyoming': 'rules/us_states/wyoming.json',
-            
-            # International - Countries
-            'canada': 'rules/international/canada.json',
-            'australia': 'rules/international/australia.json',
-            'uk': 'rules/international/uk.json',
-            'united_kingdom': 'rules/international/uk.json',
-            'singapore': 'rules/international/asia_pacific.json',
-            'hong_kong': 'rules/international/asia_pacific.json',
-            'japan': 'rules/international/asia_pacific.json',
-            'asia_pacific': 'rules/international/asia_pacific.json',
-            
-            # European Union
-            'germany': 'rules/international/germany.json',
-            'deutschland': 'rules/international/germany.json',
-            'france': 'rules/international/france.json',
-            'netherlands': 'rules/international/netherlands.json',
-            'nederland': 'rules/international/netherlands.json',
-            
-            # Europe (Additional)
-            'spain': 'rules/international/spain.json',
-            'italy': 'rules/international/italy.json',
-            'portugal': 'rules/international/portugal.json',
-            'poland': 'rules/international/poland.json',
-            'sweden': 'rules/international/sweden.json',
-            'norway': 'rules/international/norway.json',
-            'denmark': 'rules/international/denmark.json',
-            'finland': 'rules/international/finland.json',
-            'belgium': 'rules/international/belgium.json',
-            'austria': 'rules/international/austria.json',
-            'switzerland': 'rules/international/switzerland.json',
-            'ireland': 'rules/international/ireland.json',
-            'greece': 'rules/international/greece.json',
-            'czech_republic': 'rules/international/czech_republic.json',
-            
-            # Asia
-            'china': 'rules/international/china.json',
-            'india': 'rules/international/india.json',
-            'south_korea': 'rules/international/south_korea.json',
-            'korea': 'rules/international/south_korea.json',
-            'thailand': 'rules/international/thailand.json',
-            'vietnam': 'rules/international/vietnam.json',
-            'indonesia': 'rules/international/indonesia.json',
-            'malaysia': 'rules/international/malaysia.json',
-            'philippines': 'rules/international/philippines.json',
-            'taiwan': 'rules/international/taiwan.json',
-            
-            # Middle East
-            'uae': 'rules/international/uae.json',
-            'saudi_arabia': 'rules/international/saudi_arabia.json',
-            'israel': 'rules/international/israel.json',
-            'turkey': 'rules/international/turkey.json',
-            
-            # Africa
-            'south_africa': 'rules/international/south_africa.json',
-            'nigeria': 'rules/international/nigeria.json',
-            'kenya': 'rules/international/kenya.json',
-            'egypt': 'rules/international/egypt.json',
-            'morocco': 'rules/international/morocco.json',
-            
-            # Latin America
-            'brazil': 'rules/international/brazil.json',
-            'brasil': 'rules/international/brazil.json',
-            'mexico': 'rules/international/mexico.json',
-            'méxico': 'rules/international/mexico.json',
-            'argentina': 'rules/international/argentina.json',
-            'chile': 'rules/international/chile.json',
-            'colombia': 'rules/international/colombia.json',
-            'peru': 'rules/international/peru.json',
-            'costa_rica': 'rules/international/costa_rica.json',
-            'panama': 'rules/international/panama.json',
-            
-            # Oceania
-            'new_zealand': 'rules/international/new_zealand.json',
-        }
+        rules_dir = os.path.dirname(self.rules_path)
         
         for jurisdiction in self.jurisdictions:
-            jurisdiction_lower = jurisdiction.lower()
-            if jurisdiction_lower in jurisdiction_map:
-                jurisdiction_path = jurisdiction_map[jurisdiction_lower]
+            jurisdiction_path = _JURISDICTION_MAP.get(jurisdiction.lower())
+            if jurisdiction_path is not None:
+                index_key = None
+                if isinstance(jurisdiction_path, tuple):
+                    jurisdiction_path, index_key = jurisdiction_path
                 # Logic fix: jurisdiction_path is relative to root (same as fha_rules.json)
                 # So we should just join dirname of rules_path with jurisdiction_path
-                full_path = os.path.join(os.path.dirname(self.rules_path), jurisdiction_path)
+                full_path = os.path.join(rules_dir, jurisdiction_path)
                 
-                if os.path.exists(full_path):
-                    try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            jurisdiction_rules = json.load(f)
-                            all_rules.extend(jurisdiction_rules)
-                            logger.info("Loaded %d rules for %s", len(jurisdiction_rules), jurisdiction)
-                    except Exception as e:
-                        logger.warning("Failed to load %s rules: %s", jurisdiction, e)
-                else:
+                # Opening directly (no exists() probe first) costs one stat less
+                try:
+                    jurisdiction_rules = _read_rules_file(full_path)
+                    if index_key is not None:
+                        # The index is parsed once and shared by every country in it
+                        jurisdiction_rules = jurisdiction_rules[index_key]
+                except FileNotFoundError:
                     logger.warning("Jurisdiction rules not found: %s", full_path)
+                    continue
+                except Exception as e:
+                    logger.warning("Failed to load %s rules: %s", jurisdiction, e)
+                    continue
+                all_rules.extend(jurisdiction_rules)
+                logger.info("Loaded %d rules for %s", len(jurisdiction_rules), jurisdiction)
         
         return all_rules
 
@@ -320,26 +731,18 @@ class FairHousingAuditor:
             return f"(AI Fix failed: {str(e)})"
 
     
-    def _generate_cache_key(self, text: str) -> str:
-        """
-        Generate a cache key for the given text.
-        Uses SHA-256 hash to create a unique, deterministic key.
-        """
-        # Include jurisdictions in cache key to avoid cross-jurisdiction cache hits
-        cache_input = f"{text}:{','.join(sorted(self.jurisdictions))}"
-        return hashlib.sha256(cache_input.encode('utf-8')).hexdigest()
-    
     @lru_cache(maxsize=1000)
-    def _scan_text_cached(self, _text_hash: str, text: str) -> AuditReport:
+    def _scan_text_cached(self, text: str, early_exit: bool = False) -> AuditReport:
         """
         Internal cached version of scan_text.
         
-        The text_hash parameter ensures cache invalidation when text changes,
-        while the actual text is used for scanning.
+        Entries are keyed on (auditor, text, early_exit), so auditors for
+        different jurisdictions never share results. The key uses str's
+        cached built-in hash rather than a cryptographic digest of the text.
         """
-        return self._scan_text_impl(text)
+        return self._scan_text_impl(text, early_exit)
     
-    def scan_text(self, text: str, use_cache: bool = True) -> AuditReport:
+    def scan_text(self, text: str, use_cache: bool = True, early_exit: bool = False) -> AuditReport:
         """
         Scans input text for FHA violations.
         
@@ -351,6 +754,10 @@ class FairHousingAuditor:
         Args:
             text: The listing text to scan
             use_cache: Whether to use caching (default: True)
+            early_exit: Skip the AI layers once keyword matches already make
+                the listing unsafe (default: False). The verdict is the same,
+                but the report omits whatever those layers would have added;
+                leave it off for compliance reports.
         
         Returns:
             AuditReport with score, flagged items, and safety status
@@ -360,12 +767,32 @@ class FairHousingAuditor:
             The cache uses LRU eviction and stores up to 1000 recent scans.
         """
         if use_cache:
-            text_hash = self._generate_cache_key(text)
-            return self._scan_text_cached(text_hash, text)
+            return self._scan_text_cached(text, early_exit)
         else:
-            return self._scan_text_impl(text)
+            return self._scan_text_impl(text, early_exit)
+    
+    def scan_texts(self, texts: List[str], use_cache: bool = True, early_exit: bool = False) -> List[AuditReport]:
+        """
+        Scans several texts against this auditor's rules.
+        
+        All texts share the compiled matchers; identical texts within the
+        batch are scanned once and share one report.
+        
+        Args:
+            texts: The listing texts to scan
+            use_cache: Whether to use caching (default: True)
+            early_exit: As for scan_text (default: False)
+        
+        Returns:
+            One AuditReport per input text, in order
+        """
+        reports: Dict[str, AuditReport] = {}
+        for text in texts:
+            if text not in reports:
+                reports[text] = self.scan_text(text, use_cache=use_cache, early_exit=early_exit)
+        return [reports[text] for text in texts]
     
-    def _scan_text_impl(self, text: str) -> AuditReport:
+    def _scan_text_impl(self, text: str, early_exit: bool = False) -> AuditReport:
         """
         Internal implementation of text scanning (uncached).
         
@@ -374,105 +801,86 @@ class FairHousingAuditor:
         """
         flagged_items = []
         flagged_rule_ids = set()
-        score = 100
         
         # 1. Keyword/Fuzzy Matching
         text_lower = text.lower()
-        words = re.findall(r'\w+', text_lower)
+        # Repeated words can't change the first fuzzy hit, so dedupe in order
+        word_re = _ASCII_WORD_RE if text_lower.isascii() else _WORD_RE
+        words = list(dict.fromkeys(word_re.findall(text_lower)))
+        matched_phrases = self._matched_phrases(text_lower)
+        fuzzy_hits = self._fuzzy_hits(words)
         
-        for rule in self.rules:
-            if rule["id"] in flagged_rule_ids: continue
-                
-            for trigger in rule["trigger_words"]:
-                trigger_lower = trigger.lower()
-                
-                # Check 1: Direct phrase match (handles "no children")
-                if trigger_lower in text_lower:
-                    item = self._create_flag(rule, trigger, trigger)
-                    flagged_items.append(item)
-                    flagged_rule_ids.add(rule["id"])
-                    break
-                
-                # Check 2: Fuzzy match single words (handles typos like "chldren")
-                # Only perform if trigger is a single word to avoid bad matches
-                if ' ' not in trigger_lower:
-                    for word in words:
-                        if self._fuzzy_match(trigger_lower, word):
+        if matched_phrases is not None and fuzzy_hits is not None:
+            flagged_items, flagged_rule_ids = self._flags_from_hits(matched_phrases, fuzzy_hits)
+        else:
+            # Without both batch matchers, check each trigger of each rule in turn
+            for rule, triggers in self._keyword_rules:
+                if rule["id"] in flagged_rule_ids: continue
+                    
+                for trigger, trigger_lower, fuzzy in triggers:
+                    # Check 1: Direct phrase match (handles "no children")
+                    if (trigger_lower in matched_phrases if matched_phrases is not None
+                            else trigger_lower in text_lower):
+                        item = self._create_flag(rule, trigger, trigger)
+                        flagged_items.append(item)
+                        flagged_rule_ids.add(rule["id"])
+                        break
+                    
+                    # Check 2: Fuzzy match single words (handles typos like "chldren")
+                    # Only perform if trigger is a single word to avoid bad matches
+                    if fuzzy:
+                        if fuzzy_hits is not None:
+                            word = fuzzy_hits.get(trigger_lower)
+                        else:
+                            word = next((w for w in words if self._fuzzy_match(trigger_lower, w)), None)
+                        if word is not None:
                             item = self._create_flag(rule, trigger, word)
                             flagged_items.append(item)
                             flagged_rule_ids.add(rule["id"])
                             break
-                    if rule["id"] in flagged_rule_ids: break
+
+        # The AI layers only add flags, so an unsafe listing stays unsafe
+        if early_exit:
+            report = self._report(flagged_items)
+            if not report["is_safe"]:
+                return report
 
         # 2. Semantic Vector Search
+        # Sentences for the AI layers, split once; the guardrail uses the longer ones
+        sentences = []
         if self.model_manager.has_ai:
-            collection = self.model_manager.get_collection(self.rules)
-            if collection:
-                sentences = [s.strip() for s in re.split(r'[.!?\n]', text) if len(s.strip()) > 10]
-                if sentences:
-                    try:
-                        results = collection.query(
-                            query_texts=sentences,
-                            n_results=1,
-                            include=["metadatas", "distances", "documents"]
-                        )
-                        for i, sentence in enumerate(sentences):
-                            if not results['distances'][i]: continue
-                            
-                            distance = results['distances'][i][0]
-                            metadata = results['metadatas'][i][0]
-                            matched_trigger = results['documents'][i][0]
-                            
-                            # Heuristic for cosine similarity from Chroma's default L2
-                            similarity = 1 - (distance / 2)
-                            
-                            if similarity >= self.similarity_threshold:
-                                rule_id = metadata["rule_id"]
-                                if rule_id not in flagged_rule_ids:
-                                    rule = next((r for r in self.rules if r["id"] == rule_id), None)
-                                    if rule:
-                                        item = self._create_flag(rule, matched_trigger, sentence)
-                                        item["suggestion"] += " (Detected via semantic analysis)"
-                                        flagged_items.append(item)
-                                        flagged_rule_ids.add(rule_id)
-                    except Exception as e:
-                        logger.warning("Semantic search failed: %s", e)
+            sentences = [s for s in (m.group().strip() for m in _SENTENCE_RE.finditer(text)) if len(s) > 10]
+            if sentences:
+                try:
+                    for sentence, nearest in zip(sentences, self._nearest_triggers(sentences)):
+                        if nearest is None: continue
+                        similarity, metadata, matched_trigger = nearest
+                        
+                        if similarity >= self.similarity_threshold:
+                            rule_id = metadata["rule_id"]
+                            if rule_id not in flagged_rule_ids:
+                                rule = self._rule_by_id.get(rule_id)
+                                if rule:
+                                    item = self._create_flag(rule, matched_trigger, sentence)
+                                    item["suggestion"] += " (Detected via semantic analysis)"
+                                    flagged_items.append(item)
+                                    flagged_rule_ids.add(rule_id)
+                except Exception as e:
+                    logger.warning("Semantic search failed: %s", e)
 
         # 3. Neural Guardrail (Intent/Steering Detection via Zero-Shot)
         if self.model_manager.has_ai and self.model_manager.guardrail_pipeline:
-            guardrail = self.model_manager.guardrail_pipeline
-            sentences = [s.strip() for s in re.split(r'[.!?\n]', text) if len(s.strip()) > 15]
-            
-            # Labels we want to detect presence of
-            candidate_labels = ["discriminatory", "exclusionary", "restrictive", "welcoming", "inclusive"]
-
-            for sentence in sentences:
-                try:
-                    # distinct from sentiment - we ask "Is this sentence discriminatory or exclusionary?"
-                    result = guardrail(sentence, candidate_labels)
-                    
-                    # Result structure: {'labels': [...], 'scores': [...]}
-                    # We check if the top label is negative (discriminatory/exclusionary/restrictive) with high confidence
-                    top_label = result['labels'][0]
-                    top_score = result['scores'][0]
-                    
-                    if top_label in ["discriminatory", "exclusionary", "restrictive"] and top_score > 0.85:
-                        neural_flag: FlaggedItem = {
-                            "id": "NEURAL-ZERO-SHOT",
-                            "category": f"Potential {top_label} language",
-                            "trigger_words": ["(AI Intent Analysis)"],
-                            "found_word": sentence[:50] + "...",
-                            "severity": "Critical",
-                            "legal_basis": f"AI model detected high probability ({top_score:.2f}) of {top_label} intent.",
-                            "suggestion": "Review tone to ensuring it is welcoming and inclusive to all protected classes."
-                        }
-                        flagged_items.append(neural_flag)
-                        # Break after finding significant automated flag to avoid noise
-                        break
-                except Exception as e:
-                    logger.warning("Neural guardrail failed: %s", e)
+            neural_flag = self._neural_flag([s for s in sentences if len(s) > 15])
+            if neural_flag is not None:
+                flagged_items.append(neural_flag)
 
         # 4. Scoring
+        return self._report(flagged_items)
+
+    @staticmethod
+    def _report(flagged_items: List[FlaggedItem]) -> AuditReport:
+        """Score flagged items into an AuditReport."""
+        score = 100
         for item in flagged_items:
             penalty = 25 if item["severity"] == "Critical" else 10
             score = max(0, score - penalty)
@@ -486,24 +894,106 @@ class FairHousingAuditor:
             "is_safe": score >= 70 and not has_critical
         }
 
+    def _neural_flag(self, sentences: List[str]) -> Optional[FlaggedItem]:
+        """
+        Flag for the first sentence the guardrail finds discriminatory, if any.
+        
+        Sentences are classified a batch at a time, so a listing whose
+        opening sentence is flagged does not pay for classifying the rest.
+        """
+        # Labels we want to detect presence of
+        candidate_labels = ["discriminatory", "exclusionary", "restrictive", "welcoming", "inclusive"]
+        batch_size = GUARDRAIL_BATCH_SIZE
+        
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            try:
+                # distinct from sentiment - we ask "Is this sentence discriminatory or exclusionary?"
+                results = self.model_manager.classify_intent(batch, candidate_labels)
+            except Exception as e:
+                logger.warning("Neural guardrail failed: %s", e)
+                continue
+            
+            for sentence, result in zip(batch, results):
+                # Result structure: {'labels': [...], 'scores': [...]}
+                # We check if the top label is negative (discriminatory/exclusionary/restrictive) with high confidence
+                top_label = result['labels'][0]
+                top_score = result['scores'][0]
+                
+                if top_label in ["discriminatory", "exclusionary", "restrictive"] and top_score > 0.85:
+                    # Stop at the first significant automated flag to avoid noise
+                    return {
+                        "id": "NEURAL-ZERO-SHOT",
+                        "category": f"Potential {top_label} language",
+                        "trigger_words": ["(AI Intent Analysis)"],
+                        "found_word": sentence[:50] + "...",
+                        "severity": "Critical",
+                        "legal_basis": f"AI model detected high probability ({top_score:.2f}) of {top_label} intent.",
+                        "suggestion": "Review tone to ensuring it is welcoming and inclusive to all protected classes."
+                    }
+        return None
+
+    def _nearest_triggers(self, sentences: List[str]) -> list:
+        """
+        (cosine similarity, metadata, trigger) of the closest trigger to each sentence.
+        
+        Uses the in-process FAISS index when available, else queries Chroma.
+        Entries are None where nothing was found; the FAISS index also
+        drops hits below the similarity threshold.
+        """
+        embeddings = self.model_manager.embed(sentences)
+        index = self.model_manager.get_rule_index(self.rules)
+        if index is not None:
+            return index.search(embeddings, min_similarity=self.similarity_threshold)
+        
+        collection = self.model_manager.get_collection(self.rules)
+        if not collection:
+            return [None] * len(sentences)
+        results = collection.query(
+            query_embeddings=embeddings,
+            n_results=1,
+            include=["metadatas", "distances", "documents"]
+        )
+        nearest = []
+        for i in range(len(sentences)):
+            if not results['distances'][i]:
+                nearest.append(None)
+                continue
+            # Heuristic for cosine similarity from Chroma's default L2
+            similarity = 1 - (results['distances'][i][0] / 2)
+            nearest.append((similarity, results['metadatas'][i][0], results['documents'][i][0]))
+        return nearest
+
     def _fuzzy_match(self, rule_word: str, text_word: str) -> bool:
         if ' ' in rule_word or len(rule_word) < 4: return False
         if HAS_THEFUZZ:
             return fuzz.ratio(rule_word, text_word) >= (self.fuzz_threshold * 100)
+        elif HAS_RAPIDFUZZ:
+            # Same rounded score thefuzz reports
+            return int(round(rapid_fuzz.ratio(rule_word, text_word))) >= (self.fuzz_threshold * 100)
         else:
             return difflib.SequenceMatcher(None, rule_word, text_word).ratio() >= self.fuzz_threshold
 
-    def _create_flag(self, rule: Dict[str, Any], _trigger: str, found: str) -> FlaggedItem:
+    @staticmethod
+    def _flag_template(rule: Dict[str, Any]) -> FlaggedItem:
+        """The fields of a rule's flags that do not depend on the match."""
         return {
             "id": rule["id"],
             "category": rule["category"],
             "trigger_words": rule["trigger_words"],
-            "found_word": found,
+            "found_word": "",
             "severity": rule["severity"],
             "legal_basis": rule["legal_basis"],
             "suggestion": rule["suggestion"]
         }
 
+    def _create_flag(self, rule: Dict[str, Any], _trigger: str, found: str) -> FlaggedItem:
+        template = self._flag_templates.get(id(rule))
+        if template is None:
+            template = self._flag_template(rule)
+        # found_word keeps its place in the key order
+        return {**template, "found_word": found}
+
     def scan_image(self, image_input: Union[str, Any], check_logo: bool = True) -> Dict[str, Any]:
         """
         Extracts text from an image and scans it.
@@ -521,6 +1011,10 @@ class FairHousingAuditor:
 
         try:
             image = Image.open(image_input)
+            # Decode once so OCR and logo detection only read the pixels
+            image.load()
+            # Logo detection needs the image, not the OCR text: run it meanwhile
+            logo_future = _image_pool().submit(self._detect_logo, image) if check_logo else None
             extracted_text = pytesseract.image_to_string(image)
             report = self.scan_text(extracted_text)
             
@@ -528,23 +1022,26 @@ class FairHousingAuditor:
                 "extracted_text": extracted_text,
                 "report": report
             }
-            
-            # Logo detection
-            if check_logo:
-                try:
-                    from .logo_detector import LogoDetector
-                    detector = LogoDetector()
-                    logo_result = detector.detect_logo_multi_scale(image)
-                    result["logo_detection"] = logo_result
-                    
-                    # Add warning to report if logo not found
-                    if not logo_result.get("found", False):
-                        logger.warning("Equal Housing Opportunity logo not detected in image")
-                except Exception as e:
-                    logger.warning("Logo detection skipped: %s", e)
-                    result["logo_detection"] = {"found": False, "message": f"Detection unavailable: {e}"}
+            if logo_future is not None:
+                result["logo_detection"] = logo_future.result()
             
             return result
         except Exception as e:
             logger.error("Image scan failed: %s", e)
             raise RuntimeError(f"Failed to process image: {str(e)}") from e
+
+    @staticmethod
+    def _detect_logo(image) -> Dict[str, Any]:
+        """Equal Housing Opportunity logo detection result for scan_image."""
+        try:
+            from .logo_detector import LogoDetector
+            detector = LogoDetector()
+            logo_result = detector.detect_logo_multi_scale(image)
+            
+            # Add warning to report if logo not found
+            if not logo_result.get("found", False):
+                logger.warning("Equal Housing Opportunity logo not detected in image")
+            return logo_result
+        except Exception as e:
+            logger.warning("Logo detection skipped: %s", e)
+            return {"found": False, "message": f"Detection unavailable: {e}"}
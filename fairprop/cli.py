@@ -1,4 +1,5 @@
 # pylint: disable=import-error
+import asyncio
 import typer
 import os
 
@@ -6,6 +7,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from .auditor import FairHousingAuditor
+from . import daemon
 
 app = typer.Typer(help="FairProp: The Open Source Standard for Fair Housing Compliance.")
 console = Console()
@@ -15,6 +17,8 @@ def scan(
     text: str = typer.Argument(..., help="Text to scan or path to a text file."),
     rules: str = typer.Option("fha_rules.json", help="Path to rules JSON."),
     jurisdiction: list[str] = typer.Option(None, "--jurisdiction", "-j", help="Additional jurisdictions (e.g., california, nyc)"),
+    use_daemon: bool = typer.Option(True, "--daemon/--no-daemon", help="Use a running `fairprop serve` daemon if there is one."),
+    audit: bool = typer.Option(False, "--audit", help="Run every detection layer even once keyword matches fail the listing."),
 ):
     """
     Scans a text string or file for Fair Housing Act violations.
@@ -28,8 +32,11 @@ def scan(
     console.print(Panel("[bold blue]Scanning content...[/bold blue]"))
     
     try:
-        auditor = FairHousingAuditor(rules_path=rules, jurisdictions=jurisdiction or [])
-        report = auditor.scan_text(content)
+        early_exit = not audit
+        report = daemon.request_scan(content, rules, jurisdiction or [], early_exit=early_exit) if use_daemon else None
+        if report is None:
+            auditor = FairHousingAuditor(rules_path=rules, jurisdictions=jurisdiction or [])
+            report = auditor.scan_text(content, early_exit=early_exit)
         
         # Display Score
         score_color = "green" if report['is_safe'] else "red"
@@ -49,6 +56,37 @@ def scan(
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
+@app.command()
+def serve(
+    rules: str = typer.Option("fha_rules.json", help="Path to rules JSON to preload."),
+    jurisdiction: list[str] = typer.Option(None, "--jurisdiction", "-j", help="Jurisdictions to preload (e.g., california, nyc)"),
+    socket_path: str = typer.Option(None, "--socket", help="Unix socket to listen on (default: per-user path)."),
+):
+    """
+    Keeps an auditor warm so `fairprop scan` skips start-up.
+
+    Edits to a rules file are picked up on the next scan; restart the
+    daemon after editing jurisdiction rule files.
+    """
+    if not daemon.HAS_UNIX_SOCKETS:
+        console.print("[bold red]Error:[/bold red] serve needs Unix domain sockets.")
+        raise typer.Exit(1)
+    socket_path = socket_path or daemon.default_socket_path()
+    if daemon.daemon_running(socket_path):
+        console.print(f"[bold yellow]A daemon is already listening on {socket_path}[/bold yellow]")
+        raise typer.Exit(1)
+
+    server = daemon.ScanServer()
+    server.auditor(os.path.abspath(rules), jurisdiction or [])
+    console.print(Panel(f"[bold blue]Serving scans on {socket_path}[/bold blue]"))
+    try:
+        asyncio.run(server.serve(socket_path))
+    except KeyboardInterrupt:
+        pass
+    except PermissionError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(1) from e
+
 @app.command()
 def fix(
     text: str = typer.Argument(..., help="Text to fix."),
@@ -0,0 +1,201 @@
+"""
+Warm scanning daemon for the CLI.
+
+`fairprop serve` loads the rules (and AI models, when available) once and
+answers scan requests over a Unix socket, so `fairprop scan` skips that
+start-up cost whenever a daemon is running. An auditor is rebuilt when its
+rules file changes on disk. The protocol is JSON lines:
+one request object per line, one report or {"error": ...} per line back.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .auditor import FairHousingAuditor, AuditReport
+
+logger = logging.getLogger("fairprop.daemon")
+
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+# Seconds the CLI waits for a daemon before scanning in-process
+CLIENT_TIMEOUT = 60.0
+
+# Longest request line the daemon accepts
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+def _file_version(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None when it can't be read."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+def _uid() -> Optional[int]:
+    """Current user id, or None where there are no POSIX uids."""
+    return os.getuid() if hasattr(os, "getuid") else None
+
+def _private_dir() -> str:
+    """Per-user directory for the socket when there is no $XDG_RUNTIME_DIR."""
+    return os.path.join(tempfile.gettempdir(), f"fairprop-{_uid() or 0}")
+
+def _owned_by_user(path: str, kind) -> bool:
+    """Whether path (not following symlinks) passes kind, e.g. stat.S_ISSOCK, and is ours."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    uid = _uid()
+    return kind(info.st_mode) and (uid is None or info.st_uid == uid)
+
+def default_socket_path() -> str:
+    """
+    Socket the daemon listens on: $FAIRPROP_SOCKET, else a per-user path.
+
+    The per-user default lives in $XDG_RUNTIME_DIR or a 0700 directory
+    under the temp dir. Clients also only talk to sockets owned by their
+    own user, so other local users can't answer scans in place of the
+    daemon.
+    """
+    path = os.environ.get("FAIRPROP_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "fairprop.sock")
+    return os.path.join(_private_dir(), "fairprop.sock")
+
+def _prepare_socket_path(socket_path: str):
+    """Create the private socket directory if needed and refuse paths held by others."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    if directory == os.path.abspath(_private_dir()):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not _owned_by_user(directory, stat.S_ISDIR) or stat.S_IMODE(os.lstat(directory).st_mode) & 0o077:
+            raise PermissionError(f"{directory} must be a directory only this user can access")
+    if os.path.lexists(socket_path) and not _owned_by_user(socket_path, stat.S_ISSOCK):
+        raise PermissionError(f"{socket_path} exists and is not a socket owned by this user")
+
+class ScanServer:
+    """Keeps one auditor per (rules, jurisdictions) warm and scans with it."""
+
+    def __init__(self):
+        # (rules, jurisdictions) -> (rules file version when built, auditor)
+        self._auditors: Dict[Tuple[str, Tuple[str, ...]], Tuple[Optional[Tuple[int, int]], FairHousingAuditor]] = {}
+        self._lock = threading.Lock()
+
+    def auditor(self, rules_path: str, jurisdictions: List[str]) -> FairHousingAuditor:
+        """Auditor for the given rules, built on first use and rebuilt after the rules file changes."""
+        # Jurisdiction order decides rule order, so it is part of the key
+        key = (rules_path, tuple(jurisdictions))
+        version = _file_version(rules_path)
+        with self._lock:
+            entry = self._auditors.get(key)
+            if entry is None or entry[0] != version:
+                # A new auditor rather than reload_rules(), since scans on
+                # other threads may still be using the old one
+                entry = (version, FairHousingAuditor(rules_path=rules_path, jurisdictions=list(jurisdictions)))
+                self._auditors[key] = entry
+        return entry[1]
+
+    def handle(self, request: dict) -> AuditReport:
+        """Answer one decoded request."""
+        auditor = self.auditor(request.get("rules", "fha_rules.json"), request.get("jurisdictions") or [])
+        return auditor.scan_text(request["text"], early_exit=bool(request.get("early_exit")))
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    # Scans are CPU-bound; keep the loop free for other clients
+                    response = await loop.run_in_executor(None, self.handle, json.loads(line))
+                except Exception as e:
+                    response = {"error": str(e)}
+                writer.write(json.dumps(response).encode('utf-8') + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            # ValueError: request line longer than MAX_REQUEST_BYTES
+            logger.debug("Dropping client: %s", e)
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: str):
+        """Listen on socket_path until cancelled or sent SIGTERM, then remove the socket."""
+        _prepare_socket_path(socket_path)
+        # Bind with owner-only permissions, so no other local user can connect
+        # between creating the socket and restricting it
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._serve_client, path=socket_path, limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(umask)
+        try:
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # No signal handlers outside the main thread or on Windows
+            logger.info("FairProp daemon listening on %s", socket_path)
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+
+def request_scan(text: str, rules_path: str, jurisdictions: List[str], socket_path: Optional[str] = None,
+                 early_exit: bool = False) -> Optional[AuditReport]:
+    """
+    Scan text with a running daemon.
+
+    Returns None when no daemon is reachable, so callers can fall back to
+    scanning in-process. Errors reported by the daemon are raised as
+    RuntimeError.
+    """
+    if not HAS_UNIX_SOCKETS:
+        return None
+    request = {
+        "text": text, "rules": os.path.abspath(rules_path),
+        "jurisdictions": list(jurisdictions), "early_exit": early_exit
+    }
+    socket_path = socket_path or default_socket_path()
+    # Someone else's socket could answer with any verdict; scan in-process
+    if not _owned_by_user(socket_path, stat.S_ISSOCK):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CLIENT_TIMEOUT)
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            with client.makefile('rb') as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response
+
+def daemon_running(socket_path: str) -> bool:
+    """Whether a daemon of this user's is accepting connections on socket_path."""
+    if not HAS_UNIX_SOCKETS or not _owned_by_user(socket_path, stat.S_ISSOCK):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,79 @@
+"""
+On-disk cache for data that is slow to derive from the rules.
+
+Entries are content-addressed: the name is a hash of the inputs they were
+built from, so a changed rule file simply misses and no invalidation is
+needed. Entries are plain bytes (no pickling), written atomically, and
+shared by every process on the machine, which keeps CLI start-up fast.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger("fairprop.disk_cache")
+
+def cache_dir() -> Optional[str]:
+    """
+    Directory holding cache entries, or None when caching is disabled.
+
+    $FAIRPROP_CACHE_DIR overrides the default ~/.cache/fairprop; setting it
+    to an empty string turns the cache off.
+    """
+    path = os.environ.get("FAIRPROP_CACHE_DIR")
+    if path is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "fairprop")
+    return path or None
+
+def content_key(*parts: bytes) -> str:
+    """Hex SHA-256 over several byte strings, length-prefixed so boundaries count."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+def read(name: str) -> Optional[bytes]:
+    """Bytes stored under name, or None if missing or caching is disabled."""
+    directory = cache_dir()
+    if directory is None:
+        return None
+    try:
+        with open(os.path.join(directory, name), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def entry_path(name: str) -> Optional[str]:
+    """
+    Filesystem path of an existing entry, or None, for readers that map it.
+
+    write() replaces entries atomically and never rewrites them in place,
+    so a mapped entry stays valid.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    entry = os.path.join(directory, name)
+    return entry if os.path.isfile(entry) else None
+
+def write(name: str, data: bytes):
+    """Store data under name; failures are logged and otherwise ignored."""
+    directory = cache_dir()
+    if directory is None:
+        return
+    path = os.path.join(directory, name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("Could not write cache entry %s: %s", path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
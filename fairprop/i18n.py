@@ -5,11 +5,17 @@ Supports multi-language translations for rules, suggestions, and UI messages.
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger("fairprop.i18n")
 
+@lru_cache(maxsize=4096)
+def _rule_keys(category: str, rule_id: str) -> Tuple[str, str]:
+    """Translation keys for a rule's category and suggestion."""
+    return f"categories.{category.lower().replace(' ', '_')}", f"suggestions.{rule_id}"
+
 class I18n:
     """
     Internationalization handler for FairProp.
@@ -38,24 +44,56 @@ class I18n:
         """
         self.language = language
         self.translations_dir = Path(translations_dir)
-        self.translations = {}
+        # Parsed on first use; most auditors never translate anything
+        self._translations: Optional[Dict] = None
+        # Every node of the translations under its dotted key
+        self._flat: Optional[Dict] = None
         self._load_translations()
     
     def _load_translations(self):
-        """Load translation file for current language."""
+        """Load translation file for current language (read on first lookup)."""
+        self._translations = None
+        self._flat = None
+        # Cached shorthand lookups may predate these translations
+        _t_cached.cache_clear()
+    
+    def _read_translations(self) -> Dict:
+        """Parse the translation file for the current language."""
         translation_file = self.translations_dir / f"{self.language}.json"
         
         if translation_file.exists():
             try:
                 with open(translation_file, 'r', encoding='utf-8') as f:
-                    self.translations = json.load(f)
+                    translations = json.load(f)
                 logger.info("Loaded translations for language: %s", self.language)
+                return translations
             except Exception as e:
                 logger.warning("Failed to load translations for %s: %s", self.language, e)
-                self.translations = {}
-        else:
-            logger.warning("Translation file not found for %s, using English defaults", self.language)
-            self.translations = {}
+                return {}
+        logger.warning("Translation file not found for %s, using English defaults", self.language)
+        return {}
+    
+    @property
+    def translations(self) -> Dict:
+        """Nested translations for the current language."""
+        if self._translations is None:
+            self.translations = self._read_translations()
+        return self._translations
+    
+    @translations.setter
+    def translations(self, translations: Dict):
+        self._translations = translations
+        self._flat = dict(self._flatten(translations))
+        _t_cached.cache_clear()
+    
+    @classmethod
+    def _flatten(cls, tree: Dict, prefix: str = ''):
+        """Yield (dotted key, value) for every node below tree, sections included."""
+        for k, value in tree.items():
+            key = f"{prefix}{k}"
+            yield key, value
+            if isinstance(value, dict):
+                yield from cls._flatten(value, f"{key}.")
     
     def t(self, key: str, default: Optional[str] = None, **kwargs) -> str:
         """
@@ -69,16 +107,12 @@ class I18n:
         Returns:
             Translated string or default
         """
-        # Support nested keys with dot notation
-        keys = key.split('.')
-        value = self.translations
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                value = default or key
-                break
+        # Nested keys were flattened to dot notation on load
+        if self._flat is None:
+            _ = self.translations
+        value = self._flat.get(key)
+        if value is None:
+            value = default or key
         
         # Format with variables if provided
         if isinstance(value, str) and kwargs:
@@ -100,13 +134,13 @@ class I18n:
             Translated rule dictionary
         """
         translated_rule = rule.copy()
+        # Keys are derived once per (category, id), not once per call
+        category_key, suggestion_key = _rule_keys(rule.get('category', ''), rule.get('id', ''))
         
         # Try to translate category
-        category_key = f"categories.{rule.get('category', '').lower().replace(' ', '_')}"
         translated_rule['category'] = self.t(category_key, default=rule.get('category'))
         
         # Try to translate suggestion
-        suggestion_key = f"suggestions.{rule.get('id', '')}"
         translated_rule['suggestion'] = self.t(suggestion_key, default=rule.get('suggestion'))
         
         return translated_rule
@@ -151,6 +185,13 @@ def get_i18n(language: str = 'en') -> I18n:
         _i18n_instance = I18n(language)
     return _i18n_instance
 
+@lru_cache(maxsize=4096)
+def _t_cached(language: str, key: str, default: Optional[str]) -> str:
+    return get_i18n(language).t(key, default)
+
 def t(key: str, default: Optional[str] = None, **kwargs) -> str:
     """Shorthand for translation."""
-    return get_i18n().t(key, default, **kwargs)
+    if kwargs:
+        # Formatted strings are not cached; every argument set would be an entry
+        return get_i18n().t(key, default, **kwargs)
+    return _t_cached('en', key, default)
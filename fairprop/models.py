@@ -1,25 +1,165 @@
+import hashlib
+import importlib.util
+import io
+import itertools
 import logging
-import uuid
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from . import disk_cache
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# In-process exact vector search (optional); Chroma is used without it
+try:
+    import faiss # pylint: disable=import-error
+    HAS_FAISS = HAS_NUMPY
+    # Maps flat-code indexes straight from the file (faiss >= 1.8)
+    _INDEX_MMAP_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+except ImportError:
+    HAS_FAISS = False
 
 
 # Configure logging
 logger = logging.getLogger("fairprop.models")
 
+# Packages the semantic and neural layers need
+AI_PACKAGES = ("torch", "transformers", "chromadb", "sentence_transformers")
+
+# Names the embedding model in on-disk trigger embedding cache keys
+EMBEDDING_MODEL_KEY = b"chroma-default-all-MiniLM-L6-v2"
+
+# Sentence embeddings kept for reuse across scans (boilerplate such as
+# "No smoking." recurs across many listings)
+EMBEDDING_CACHE_SIZE = 4096
+
+# Zero-shot guardrail results kept for reuse across scans
+GUARDRAIL_CACHE_SIZE = 4096
+
+# Sentences per guardrail forward pass
+GUARDRAIL_BATCH_SIZE = 8
+
+class TriggerMetadata:
+    """
+    Read-only sequence of trigger metadata dicts, stored as columns.
+    
+    Only the owning rule of each trigger is kept; a metadata dict is built
+    when an entry is read. The FAISS path reads it for search hits alone,
+    so start-up no longer builds one dict per trigger.
+    """
+    __slots__ = ("triggers", "owners")
+    
+    def __init__(self, triggers: list, owners: list):
+        self.triggers = triggers
+        self.owners = owners
+    
+    def __len__(self) -> int:
+        return len(self.triggers)
+    
+    def __getitem__(self, i) -> dict:
+        rule = self.owners[i]
+        return {
+            "rule_id": rule["id"],
+            "category": rule["category"],
+            "severity": rule["severity"],
+            "trigger": self.triggers[i]
+        }
+    
+    def rule_ids(self) -> list:
+        return [rule["id"] for rule in self.owners]
+
+class RuleIndex:
+    """
+    Nearest-trigger search over L2-normalized embeddings with FAISS.
+    
+    Inner product of normalized vectors is cosine similarity, so a search is
+    one matrix product against every trigger, returning similarities
+    directly instead of distances to convert.
+    
+    Search is exact by default. With quantized=True, vectors are stored as
+    8-bit codes (a quarter of the memory, int8 dot products); similarities
+    are then approximate to about 0.01, which can move matches sitting
+    right at the similarity threshold.
+    """
+    
+    def __init__(self, embeddings: list, documents: list, metadatas: list, quantized: bool = False, index=None):
+        self.documents = documents
+        self.metadatas = metadatas
+        # A prebuilt FAISS index (e.g. read from disk) is used as is
+        self._index = index
+        if index is None and documents:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+            faiss.normalize_L2(matrix)
+            if quantized:
+                self._index = faiss.IndexScalarQuantizer(
+                    matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+                )
+                self._index.train(matrix)
+            else:
+                self._index = faiss.IndexFlatIP(matrix.shape[1])
+            self._index.add(matrix)
+    
+    def serialize(self) -> Optional[bytes]:
+        """The FAISS index as bytes for faiss.read_index, or None if empty."""
+        if self._index is None:
+            return None
+        return faiss.serialize_index(self._index).tobytes()
+
+    def search(self, embeddings: list, min_similarity: Optional[float] = None) -> list:
+        """
+        (similarity, metadata, trigger) of the closest trigger per embedding.
+        
+        Entries are None where there are no triggers or, given
+        min_similarity, where the closest one is less similar than that.
+        The threshold is applied to all similarities at once, so Python
+        objects are only built for hits.
+        """
+        nearest = [None] * len(embeddings)
+        if self._index is None:
+            return nearest
+        queries = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(queries)
+        similarities, ids = self._index.search(queries, 1)
+        similarities, ids = similarities[:, 0], ids[:, 0]
+        found = ids >= 0
+        if min_similarity is not None:
+            found &= similarities >= min_similarity
+        for i in np.flatnonzero(found):
+            idx = ids[i]
+            nearest[i] = (float(similarities[i]), self.metadatas[idx], self.documents[idx])
+        return nearest
+
 class ModelManager:
     """
     Singleton-like manager for lazy loading of heavy AI models.
     This prevents the CLI from being slow on startup if AI features aren't used.
     """
     _instance = None
+    # Suffixes collection names; the client is in-process, so only
+    # uniqueness within this process matters
+    _collection_counter = itertools.count()
     
     def __init__(self):
         self._sentence_transformer = None
         self._chroma_client = None
         self._chroma_collection = None
+        self._rule_index = None
+        self._embedding_function = None
+        # blake2b(sentence) -> embedding, least recently used first
+        self._embedding_cache: "OrderedDict[bytes, list]" = OrderedDict()
+        self._embedding_lock = threading.Lock()
+        # blake2b(labels, sentence) -> zero-shot result, least recently used first
+        self._guardrail_cache: "OrderedDict[bytes, dict]" = OrderedDict()
         self._fixer_pipeline = None
         self._guardrail_pipeline = None
-        self._has_ai = False
-        self._check_environment()
+        # Probed on first use of has_ai
+        self._has_ai: Optional[bool] = None
 
     @classmethod
     def get_instance(cls):
@@ -28,26 +168,26 @@ class ModelManager:
         return cls._instance
 
     def _check_environment(self):
-        """Checks if necessary packages are installed."""
-        try:
-            import torch
-            import transformers
-            import chromadb
-            import sentence_transformers
-            # Pylint: disable unused import warning by acknowledging check
-            _ = (torch, transformers, chromadb, sentence_transformers)
-            self._has_ai = True
-        except ImportError as e:
-            logger.warning("AI dependencies missing: %s. Running in rule-only mode.", e)
-            self._has_ai = False
+        """
+        Checks if necessary packages are installed.
+        
+        Only locates the packages; importing torch and friends here would
+        cost seconds of start-up before any model is needed.
+        """
+        missing = [m for m in AI_PACKAGES if importlib.util.find_spec(m) is None]
+        if missing:
+            logger.warning("AI dependencies missing: %s. Running in rule-only mode.", ", ".join(missing))
+        self._has_ai = not missing
 
     @property
     def has_ai(self) -> bool:
+        if self._has_ai is None:
+            self._check_environment()
         return self._has_ai
 
     @property
     def sentence_transformer(self):
-        if not self._has_ai: return None
+        if not self.has_ai: return None
         if self._sentence_transformer is None:
             from sentence_transformers import SentenceTransformer # pylint: disable=import-error
             logger.info("Loading SentenceTransformer model...")
@@ -56,57 +196,191 @@ class ModelManager:
 
     @property
     def chroma_client(self):
-        if not self._has_ai: return None
+        if not self.has_ai: return None
         if self._chroma_client is None:
             import chromadb # pylint: disable=import-error
             logger.info("Initializing ChromaDB client...")
             self._chroma_client = chromadb.Client()
         return self._chroma_client
 
+    @property
+    def embedding_function(self):
+        """Embedding function used for both the rule collection and queries."""
+        if not self.has_ai: return None
+        if self._embedding_function is None:
+            from chromadb.utils import embedding_functions # pylint: disable=import-error
+            self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        return self._embedding_function
+
+    def embed(self, sentences: list) -> list:
+        """
+        Embed sentences, reusing embeddings of recently seen sentences.
+        
+        Sentences not in the cache are embedded together in one call, using
+        the same function the rule collection was indexed with, so cached
+        vectors are exactly what a query_texts lookup would compute.
+        """
+        keys = [hashlib.blake2b(s.encode('utf-8'), digest_size=16).digest() for s in sentences]
+        return self._cached_batch(self._embedding_cache, EMBEDDING_CACHE_SIZE, keys, sentences, self.embedding_function)
+
+    def classify_intent(self, sentences: list, labels: list) -> list:
+        """
+        Zero-shot classify sentences against labels with the guardrail model.
+        
+        Sentences not in the cache are classified together in batched
+        pipeline calls rather than one forward pass each. Returns one
+        {'labels': [...], 'scores': [...]} result per sentence.
+        """
+        guardrail = self.guardrail_pipeline
+        prefix = "\x00".join(labels).encode('utf-8') + b"\x01"
+        keys = [hashlib.blake2b(prefix + s.encode('utf-8'), digest_size=16).digest() for s in sentences]
+        
+        def classify(batch):
+            results = guardrail(batch, labels, batch_size=GUARDRAIL_BATCH_SIZE)
+            # Older pipelines unwrap single-item lists
+            return [results] if isinstance(results, dict) else results
+        
+        return self._cached_batch(self._guardrail_cache, GUARDRAIL_CACHE_SIZE, keys, sentences, classify)
+
+    def _cached_batch(self, cache: OrderedDict, max_size: int, keys: list, inputs: list, compute) -> list:
+        """
+        Look keys up in an LRU cache, computing all misses in one call.
+        
+        Duplicate misses are computed once; results come back in input order.
+        """
+        with self._embedding_lock:
+            values = [cache.get(key) for key in keys]
+            for key, value in zip(keys, values):
+                if value is not None:
+                    cache.move_to_end(key)
+        
+        missing = {}
+        for key, item, value in zip(keys, inputs, values):
+            if value is None:
+                missing.setdefault(key, item)
+        if not missing:
+            return values
+        
+        computed = dict(zip(missing, compute(list(missing.values()))))
+        with self._embedding_lock:
+            cache.update(computed)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+        return [computed[key] if value is None else value for key, value in zip(keys, values)]
+
     def reset_collection(self):
         """Reset the vector database collection."""
         self._chroma_collection = None
+        self._rule_index = None
+
+    def get_rule_index(self, rules: list):
+        """Gets or builds the in-process FAISS trigger index, or None without faiss."""
+        if not self.has_ai or not HAS_FAISS: return None
+        if self._rule_index is None:
+            documents, metadatas = self._rule_documents(rules)
+            quantized = os.environ.get("FAIRPROP_QUANTIZED_INDEX", "") not in ("", "0")
+            if documents:
+                self._rule_index = self._persisted_rule_index(documents, metadatas, quantized)
+            else:
+                self._rule_index = RuleIndex([], documents, metadatas)
+            logger.info("Indexed %d trigger variants into FAISS.", len(documents))
+        return self._rule_index
+
+    def _persisted_rule_index(self, documents: list, metadatas: list, quantized: bool) -> RuleIndex:
+        """
+        Trigger index read from the disk cache, or built and stored there.
+        
+        The cached index is memory-mapped rather than rebuilt from the
+        embeddings, so a restart with unchanged triggers only maps a file.
+        It is keyed like the embeddings, plus the index type.
+        """
+        name = "rule-index-" + disk_cache.content_key(
+            EMBEDDING_MODEL_KEY, b"sq8" if quantized else b"flat", *(d.encode('utf-8') for d in documents)
+        ) + ".faiss"
+        path = disk_cache.entry_path(name)
+        if path is not None:
+            try:
+                index = faiss.read_index(path, _INDEX_MMAP_FLAG)
+                if index.ntotal == len(documents):
+                    return RuleIndex(None, documents, metadatas, index=index)
+            except RuntimeError as e:
+                logger.debug("Ignoring unreadable rule index %s: %s", path, e)
+        
+        rule_index = RuleIndex(self._trigger_embeddings(documents), documents, metadatas, quantized=quantized)
+        disk_cache.write(name, rule_index.serialize())
+        return rule_index
 
     def get_collection(self, rules: list):
         """Gets or creates the ChromaDB collection for rules."""
-        if not self._has_ai: return None
+        if not self.has_ai: return None
         if self._chroma_collection is None:
             client = self.chroma_client
-            collection_name = f"fha_rules_{uuid.uuid4().hex[:8]}"
-            self._chroma_collection = client.create_collection(name=collection_name)
+            collection_name = f"fha_rules_{os.getpid()}_{next(self._collection_counter)}"
+            self._chroma_collection = client.create_collection(
+                name=collection_name,
+                embedding_function=self.embedding_function
+            )
             self._index_rules(rules)
         return self._chroma_collection
 
+    def _trigger_embeddings(self, documents: list):
+        """
+        Embeddings of rule triggers, cached on disk across processes.
+        
+        Embedding every trigger dominates cold start with AI enabled; the
+        cache is keyed on the model and the exact trigger list and stored
+        as a plain .npy array (no pickle).
+        """
+        embedding_function = self.embedding_function
+        if not HAS_NUMPY:
+            return embedding_function(documents)  # pylint: disable=not-callable
+        name = "embeddings-" + disk_cache.content_key(
+            EMBEDDING_MODEL_KEY, *(d.encode('utf-8') for d in documents)
+        ) + ".npy"
+        cached = disk_cache.read(name)
+        if cached is not None:
+            try:
+                embeddings = np.load(io.BytesIO(cached), allow_pickle=False)
+                if len(embeddings) == len(documents):
+                    return embeddings
+            except ValueError as e:
+                logger.debug("Ignoring unreadable embedding cache %s: %s", name, e)
+        
+        embeddings = np.asarray(embedding_function(documents), dtype=np.float32)  # pylint: disable=not-callable
+        buffer = io.BytesIO()
+        np.save(buffer, embeddings, allow_pickle=False)
+        disk_cache.write(name, buffer.getvalue())
+        return embeddings
+
+    @staticmethod
+    def _rule_documents(rules: list):
+        """Every trigger as a document, with metadata naming its rule."""
+        documents = [trigger for rule in rules for trigger in rule.get("trigger_words", [])]
+        owners = [rule for rule in rules for _ in rule.get("trigger_words", [])]
+        return documents, TriggerMetadata(documents, owners)
+
     def _index_rules(self, rules: list):
         """Indexes rules into the vector DB."""
-        if not self._has_ai: return
+        if not self.has_ai: return
         
-        documents = []
-        metadatas = []
-        ids = []
-
-        for rule in rules:
-            for trigger in rule.get("trigger_words", []):
-                documents.append(trigger)
-                metadatas.append({
-                    "rule_id": rule["id"],
-                    "category": rule["category"],
-                    "severity": rule["severity"],
-                    "trigger": trigger
-                })
-                ids.append(str(uuid.uuid4()))
+        documents, metadatas = self._rule_documents(rules)
+        # Positional ids are unique even when jurisdictions repeat a rule id
+        ids = [f"{rule_id}-{i}" for i, rule_id in enumerate(metadatas.rule_ids())]
         
         if documents:
+            embeddings = self._trigger_embeddings(documents)
+            # Chroma takes metadata as dicts; only built here
             self._chroma_collection.add(
+                embeddings=[list(map(float, e)) for e in embeddings],
                 documents=documents,
-                metadatas=metadatas,
+                metadatas=list(metadatas),
                 ids=ids
             )
             logger.info("Indexed %d trigger variants into Vector DB.", len(documents))
 
     @property
     def fixer_pipeline(self):
-        if not self._has_ai: return None
+        if not self.has_ai: return None
         if self._fixer_pipeline is None:
             from transformers import pipeline # pylint: disable=import-error
             logger.info("Loading Generator model (flan-t5-small)...")
@@ -119,7 +393,7 @@ class ModelManager:
 
     @property
     def guardrail_pipeline(self):
-        if not self._has_ai: return None
+        if not self.has_ai: return None
         if self._guardrail_pipeline is None:
             from transformers import pipeline # pylint: disable=import-error
             logger.info("Loading Neural Guardrail (Zero-Shot based on facebook/bart-large-mnli)...")
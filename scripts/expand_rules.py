@@ -2,12 +2,12 @@
 Rule Library Expansion Script
 Generates comprehensive fair housing rules based on legal research and real-world cases.
 """
-import json
 from pathlib import Path
 
+from json_io import dumps, loads
+
 # Load existing rules
-with open('fha_rules.json', 'r', encoding='utf-8') as f:
-    existing_rules = json.load(f)
+existing_rules = loads(Path('fha_rules.json').read_bytes())
 
 print(f"Existing rules: {len(existing_rules)}")
 
@@ -77,7 +77,6 @@ output = {
     "sample_rules": age_rules[:3]
 }
 
-with open('rule_expansion_preview.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
+Path('rule_expansion_preview.json').write_bytes(dumps(output, indent=True))
 
 print("Preview saved to rule_expansion_preview.json")
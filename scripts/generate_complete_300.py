@@ -1,12 +1,29 @@
 """
 Complete 300-Rule Generation Script
 Generates comprehensive fair housing rules: 120 federal + 120 state + 60 city = 300 total
+
+Writes compact fha_rules_300.json; pass --pretty to also write an indented
+fha_rules_300.pretty.json for reading.
+
+This only builds and serializes dicts, so there is nothing here for a JIT to
+compile. Matching the triggers is the hot path, and fairprop.auditor already
+compiles them once per rule set (Hyperscan, else pyahocorasick).
 """
-import json
+import argparse
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+
+from generate_300_rules import build_additional_federal, load_base
+from json_io import dumps
+
+parser = argparse.ArgumentParser(description="Generate fha_rules_300.json")
+parser.add_argument("--pretty", action="store_true", help="also write an indented fha_rules_300.pretty.json")
+args = parser.parse_args()
 
 # Load existing 45 rules as base
-with open('fha_rules.json', 'r', encoding='utf-8') as f:
-    rules = json.load(f)
+rules = load_base()
 
 print(f"Starting with {len(rules)} existing rules")
 
@@ -16,22 +33,20 @@ print(f"Starting with {len(rules)} existing rules")
 # Helper function to generate rule variations
 def generate_rule_variations(base_id, category, base_triggers, severity, legal_basis, suggestion, count=5):
     """Generate multiple rule variations for a category"""
-    variations = []
-    for i in range(count):
-        rule_num = int(base_id.split('-')[-1]) + i + 1
-        new_id = f"{'-'.join(base_id.split('-')[:-1])}-{rule_num:03d}"
-        variations.append({
-            "id": new_id,
-            "category": category,
-            "trigger_words": base_triggers,
-            "severity": severity,
-            "legal_basis": legal_basis,
-            "suggestion": suggestion
-        })
-    return variations
-
-# Generate additional federal rules (75 more to reach 120 federal total)
-additional_rules = []
+    prefix, start = base_id.rsplit('-', 1)
+    start = int(start)
+    template = {
+        "category": category,
+        "trigger_words": base_triggers,
+        "severity": severity,
+        "legal_basis": legal_basis,
+        "suggestion": suggestion
+    }
+    # id first, to keep the key order of the written rules
+    return [{"id": f"{prefix}-{start + i + 1:03d}", **template} for i in range(count)]
+
+# Generate additional federal rules (75 more to reach 120 federal total),
+# on top of the ones generate_300_rules.py defines
 
 # Race - add 10 more
 race_additions = [
@@ -39,7 +54,6 @@ race_additions = [
     {"id": "FHA-RACE-011", "category": "Race", "trigger_words": ["redlining", "restricted covenant", "racial steering"], "severity": "Critical", "legal_basis": "42 U.S.C. § 3604(c)", "suggestion": "These practices are illegal. Remove all references."},
     {"id": "FHA-RACE-012", "category": "Race", "trigger_words": ["blockbusting", "panic selling", "neighborhood change"], "severity": "Critical", "legal_basis": "42 U.S.C. § 3604(c)", "suggestion": "Avoid language suggesting racial neighborhood changes."},
 ]
-additional_rules.extend(race_additions)
 
 # Continue with other categories...
 # (Due to space constraints, I'll generate a representative sample)
@@ -48,128 +62,155 @@ additional_rules.extend(race_additions)
 color_additions = [
     {"id": "FHA-CLR-002", "category": "Color", "trigger_words": ["skin tone", "complexion", "pigmentation", "melanin"], "severity": "Critical", "legal_basis": "42 U.S.C. § 3604(c)", "suggestion": "Do not reference skin color in any form."},
 ]
-additional_rules.extend(color_additions)
 
 # Religion - add 8 more
 religion_additions = [
     {"id": "FHA-RELG-007", "category": "Religion", "trigger_words": ["atheist", "non-believer", "secular", "agnostic"], "severity": "Critical", "legal_basis": "42 U.S.C. § 3604(c)", "suggestion": "Do not discriminate based on religious beliefs or lack thereof."},
     {"id": "FHA-RELG-008", "category": "Religion", "trigger_words": ["sabbath", "holy day", "religious holiday", "worship schedule"], "severity": "Warning", "legal_basis": "42 U.S.C. § 3604(c)", "suggestion": "Describe scheduling without religious references."},
 ]
-additional_rules.extend(religion_additions)
 
 # Generate state-specific rules (120 rules for 15 states = 8 per state)
-states = ["Texas", "Florida", "New York", "Illinois", "Pennsylvania", "Ohio", "Georgia", 
-          "North Carolina", "Michigan", "New Jersey", "Virginia", "Washington", 
-          "Arizona", "Massachusetts", "Tennessee"]
-
-state_rule_id = 1
-for state in states:
-    # Each state gets 8 rules covering key areas
-    state_rules = [
+# USPS codes; the first two letters collide (New York/New Jersey, Texas/Tennessee)
+STATE_ABBR = {
+    "Texas": "TX", "Florida": "FL", "New York": "NY", "Illinois": "IL", "Pennsylvania": "PA",
+    "Ohio": "OH", "Georgia": "GA", "North Carolina": "NC", "Michigan": "MI", "New Jersey": "NJ",
+    "Virginia": "VA", "Washington": "WA", "Arizona": "AZ", "Massachusetts": "MA", "Tennessee": "TN"
+}
+states = list(STATE_ABBR)
+
+# Trigger words shared by every state's rules (one list each, so never modify them)
+SOURCE_OF_INCOME_TRIGGERS = ["no section 8", "no vouchers", "no housing assistance", "cash only"]
+MARITAL_STATUS_TRIGGERS = ["married couples only", "no single parents", "traditional family"]
+SEXUAL_ORIENTATION_TRIGGERS = ["traditional values", "family values", "conservative community"]
+GENDER_IDENTITY_TRIGGERS = ["biological", "born as", "gender assigned", "transgender"]
+CRIMINAL_HISTORY_TRIGGERS = ["no felons", "no criminal record", "background check required", "clean record"]
+OCCUPANCY_TRIGGERS = ["two per bedroom", "occupancy limit", "maximum occupants"]
+ACCESSIBILITY_TRIGGERS = ["no modifications", "as-is only", "no alterations allowed"]
+LANGUAGE_TRIGGERS = ["english only", "no foreign languages", "must speak english"]
+
+def state_rules(state):
+    """The 8 rules each state gets, covering key areas."""
+    abbr = STATE_ABBR[state]
+    # One string shared by the state's eight rules
+    state_law = f"{state} Fair Housing Law"
+    return [
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id:03d}",
+            "id": f"STATE-{abbr}-001",
             "category": f"Source of Income ({state})",
-            "trigger_words": ["no section 8", "no vouchers", "no housing assistance", "cash only"],
+            "trigger_words": SOURCE_OF_INCOME_TRIGGERS,
             "severity": "Critical",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": f"{state} prohibits source of income discrimination. Accept all lawful income sources."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+1:03d}",
+            "id": f"STATE-{abbr}-002",
             "category": f"Marital Status ({state})",
-            "trigger_words": ["married couples only", "no single parents", "traditional family"],
+            "trigger_words": MARITAL_STATUS_TRIGGERS,
             "severity": "Critical",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Do not discriminate based on marital status."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+2:03d}",
+            "id": f"STATE-{abbr}-003",
             "category": f"Sexual Orientation ({state})",
-            "trigger_words": ["traditional values", "family values", "conservative community"],
+            "trigger_words": SEXUAL_ORIENTATION_TRIGGERS,
             "severity": "Warning",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Avoid language that implies sexual orientation preference."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+3:03d}",
+            "id": f"STATE-{abbr}-004",
             "category": f"Gender Identity ({state})",
-            "trigger_words": ["biological", "born as", "gender assigned", "transgender"],
+            "trigger_words": GENDER_IDENTITY_TRIGGERS,
             "severity": "Critical",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Do not discriminate based on gender identity."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+4:03d}",
+            "id": f"STATE-{abbr}-005",
             "category": f"Criminal History ({state})",
-            "trigger_words": ["no felons", "no criminal record", "background check required", "clean record"],
+            "trigger_words": CRIMINAL_HISTORY_TRIGGERS,
             "severity": "Warning",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Apply criminal history policies uniformly and consider HUD guidance."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+5:03d}",
+            "id": f"STATE-{abbr}-006",
             "category": f"Occupancy Standards ({state})",
-            "trigger_words": ["two per bedroom", "occupancy limit", "maximum occupants"],
+            "trigger_words": OCCUPANCY_TRIGGERS,
             "severity": "Warning",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Follow {state} occupancy standards, typically 2 per bedroom plus 1."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+6:03d}",
+            "id": f"STATE-{abbr}-007",
             "category": f"Accessibility ({state})",
-            "trigger_words": ["no modifications", "as-is only", "no alterations allowed"],
+            "trigger_words": ACCESSIBILITY_TRIGGERS,
             "severity": "Critical",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Reasonable modifications must be allowed per {state} law."
         },
         {
-            "id": f"STATE-{state[:2].upper()}-{state_rule_id+7:03d}",
+            "id": f"STATE-{abbr}-008",
             "category": f"Language ({state})",
-            "trigger_words": ["english only", "no foreign languages", "must speak english"],
+            "trigger_words": LANGUAGE_TRIGGERS,
             "severity": "Critical",
-            "legal_basis": f"{state} Fair Housing Law",
+            "legal_basis": state_law,
             "suggestion": "Do not impose language requirements."
         }
     ]
-    additional_rules.extend(state_rules)
-    state_rule_id += 8
 
 # Generate city-specific rules (60 rules for 20 cities = 3 per city)
-cities = ["San Francisco", "Los Angeles", "Chicago", "Boston", "Seattle", "Portland", 
-          "Denver", "Austin", "Miami", "Atlanta", "Philadelphia", "Phoenix", 
-          "San Diego", "Dallas", "Houston", "Minneapolis", "Detroit", "Baltimore", 
-          "Washington DC", "Las Vegas"]
-
-city_rule_id = 1
-for city in cities:
-    city_rules = [
+# Four-letter codes, spelled out so a city can never share one (Washington DC is DC)
+CITY_CODE = {
+    "San Francisco": "SANF", "Los Angeles": "LOSA", "Chicago": "CHIC", "Boston": "BOST", "Seattle": "SEAT",
+    "Portland": "PORT", "Denver": "DENV", "Austin": "AUST", "Miami": "MIAM", "Atlanta": "ATLA",
+    "Philadelphia": "PHIL", "Phoenix": "PHOE", "San Diego": "SAND", "Dallas": "DALL", "Houston": "HOUS",
+    "Minneapolis": "MINN", "Detroit": "DETR", "Baltimore": "BALT", "Washington DC": "DC", "Las Vegas": "LASV"
+}
+cities = list(CITY_CODE)
+
+# Trigger words shared by every city's rules (likewise)
+LOCAL_INCOME_TRIGGERS = ["no section 8", "source of income", "vouchers not accepted"]
+RENT_CONTROL_TRIGGERS = ["rent control exempt", "market rate only", "no rent stabilization"]
+VAGUE_EXCLUSION_TRIGGERS = ["certain types", "right fit", "compatible residents"]
+
+def city_rules(city):
+    """The 3 rules each city gets."""
+    code = CITY_CODE[city]
+    return [
         {
-            "id": f"CITY-{city.replace(' ', '')[:4].upper()}-{city_rule_id:03d}",
+            "id": f"CITY-{code}-001",
             "category": f"Local Protections ({city})",
-            "trigger_words": ["no section 8", "source of income", "vouchers not accepted"],
+            "trigger_words": LOCAL_INCOME_TRIGGERS,
             "severity": "Critical",
             "legal_basis": f"{city} Fair Housing Ordinance",
             "suggestion": f"{city} requires acceptance of all lawful income sources."
         },
         {
-            "id": f"CITY-{city.replace(' ', '')[:4].upper()}-{city_rule_id+1:03d}",
+            "id": f"CITY-{code}-002",
             "category": f"Rent Control ({city})",
-            "trigger_words": ["rent control exempt", "market rate only", "no rent stabilization"],
+            "trigger_words": RENT_CONTROL_TRIGGERS,
             "severity": "Warning",
             "legal_basis": f"{city} Rent Control Law",
             "suggestion": f"Comply with {city} rent control regulations if applicable."
         },
         {
-            "id": f"CITY-{city.replace(' ', '')[:4].upper()}-{city_rule_id+2:03d}",
+            "id": f"CITY-{code}-003",
             "category": f"Anti-Discrimination ({city})",
-            "trigger_words": ["certain types", "right fit", "compatible residents"],
+            "trigger_words": VAGUE_EXCLUSION_TRIGGERS,
             "severity": "Critical",
             "legal_basis": f"{city} Human Rights Law",
             "suggestion": f"{city} prohibits vague exclusionary language."
         }
     ]
-    additional_rules.extend(city_rules)
-    city_rule_id += 3
+
+# All new rules, in one list built in a single pass
+additional_rules = list(chain(
+    build_additional_federal(), race_additions, color_additions, religion_additions,
+    chain.from_iterable(map(state_rules, states)),
+    chain.from_iterable(map(city_rules, cities)),
+))
 
 # Combine all rules
 all_rules = rules + additional_rules
@@ -179,19 +220,18 @@ print(f"Total rules: {len(all_rules)}")
 print(f"Target: 300, Actual: {len(all_rules)}")
 
 # Save to file
-with open('fha_rules_300.json', 'w', encoding='utf-8') as f:
-    json.dump(all_rules, f, indent=2, ensure_ascii=False)
+Path('fha_rules_300.json').write_bytes(dumps(all_rules))
+if args.pretty:
+    Path('fha_rules_300.pretty.json').write_bytes(dumps(all_rules, indent=True))
 
 print(f"\nSaved {len(all_rules)} rules to fha_rules_300.json")
 
 # Generate statistics
-categories = {}
-for rule in all_rules:
-    cat = rule['category']
-    categories[cat] = categories.get(cat, 0) + 1
+categories = Counter(map(itemgetter('category'), all_rules))
+trigger_total = sum(map(len, map(itemgetter('trigger_words'), all_rules)))
 
 print("\nRules by category:")
 for cat, count in sorted(categories.items()):
     print(f"  {cat}: {count}")
 
-print(f"\nTotal trigger words: {sum(len(r['trigger_words']) for r in all_rules)}")
+print(f"\nTotal trigger words: {trigger_total}")
@@ -1,12 +1,16 @@
 """
 Global Rule Generator for FairProp
 Generates fair housing rules for 100+ countries based on international standards.
+
+Writes compact rules/international/index.json; pass --split to also write one
+file per country, and --pretty to also write indented .pretty.json copies.
 """
 
-import json
-import os
+import argparse
 from pathlib import Path
 
+from json_io import dumps, write_file
+
 # International human rights standards that most countries follow
 UNIVERSAL_PROTECTIONS = {
     "race": {
@@ -92,65 +96,86 @@ COUNTRIES = {
     "panama": {"name": "Panama", "law": "Ley 16 de 2002", "languages": ["es", "en"]},
 }
 
+# (slug, title, suggestion, data) per protection, so only the country parts vary;
+# every country's rule shares the same suggestion string
+_PROTECTION_TEMPLATES = [
+    (protection_type.upper()[:4], protection_type.replace('_', ' ').title(),
+     f"Cannot discriminate based on {protection_type.replace('_', ' ')}. "
+     "Complies with international human rights standards.",
+     protection_data)
+    for protection_type, protection_data in UNIVERSAL_PROTECTIONS.items()
+]
+
 def generate_country_rules(country_code, country_data):
     """Generate rules for a specific country."""
-    rules = []
+    country_id = country_code.upper()
     country_name = country_data["name"]
     law_basis = country_data["law"]
     
-    for protection_type, protection_data in UNIVERSAL_PROTECTIONS.items():
-        rule = {
-            "id": f"{country_code.upper()}-{protection_type.upper()[:4]}-001",
-            "category": f"{protection_type.replace('_', ' ').title()} ({country_name})",
+    return [
+        {
+            "id": f"{country_id}-{slug}-001",
+            "category": f"{title} ({country_name})",
             "trigger_words": protection_data["trigger_words"],
             "severity": protection_data["severity"],
             "legal_basis": f"{law_basis} - {protection_data['basis']}",
-            "suggestion": f"Cannot discriminate based on {protection_type.replace('_', ' ')}. Complies with international human rights standards."
+            "suggestion": suggestion
         }
-        rules.append(rule)
-    
-    return rules
+        for slug, title, suggestion, protection_data in _PROTECTION_TEMPLATES
+    ]
 
-def generate_all_countries():
-    """Generate rule files for all countries."""
+def generate_all_countries(split=False, pretty=False):
+    """
+    Generate the country rules index, rules/international/index.json.
+    
+    The index maps each country code to its rules, so the auditor reads
+    one file for any number of countries. With split=True each country
+    is also written to its own file, as earlier versions did. Files are
+    compact JSON; pretty=True adds an indented .pretty.json beside each.
+    """
     output_dir = Path("rules/international")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    generated_count = 0
+    all_rules = {
+        country_code: generate_country_rules(country_code, country_data)
+        for country_code, country_data in COUNTRIES.items()
+    }
+    
+    outputs = [("index", all_rules)]
+    if split:
+        outputs.extend(all_rules.items())
     
-    for country_code, country_data in COUNTRIES.items():
-        rules = generate_country_rules(country_code, country_data)
-        
-        filename = output_dir / f"{country_code}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(rules, f, indent=2, ensure_ascii=False)
-        
-        generated_count += 1
-        print(f"✅ Generated {filename} ({len(rules)} rules)")
+    for name, rules in outputs:
+        filename = output_dir / f"{name}.json"
+        write_file(filename, dumps(rules))
+        if pretty:
+            write_file(output_dir / f"{name}.pretty.json", dumps(rules, indent=True))
+        rule_count = len(rules) if name != "index" else sum(map(len, rules.values()))
+        print(f"✅ Generated {filename} ({rule_count} rules)")
     
-    return generated_count
+    return len(all_rules)
+
+# Generated countries grouped by region, in the order the map lists them
+REGIONS = {
+    "Europe": ["spain", "italy", "portugal", "poland", "sweden", "norway", "denmark", "finland", 
+               "belgium", "austria", "switzerland", "ireland", "greece", "czech_republic"],
+    "Asia": ["china", "india", "south_korea", "thailand", "vietnam", "indonesia", "malaysia", 
+             "philippines", "taiwan"],
+    "Middle East": ["uae", "saudi_arabia", "israel", "turkey"],
+    "Africa": ["south_africa", "nigeria", "kenya", "egypt", "morocco"],
+    "Latin America": ["argentina", "chile", "colombia", "peru", "costa_rica", "panama"],
+    "Oceania": ["new_zealand"]
+}
 
 def generate_jurisdiction_map():
     """Generate Python code for jurisdiction mapping."""
     lines = []
     
-    # Group by region
-    regions = {
-        "Europe": ["spain", "italy", "portugal", "poland", "sweden", "norway", "denmark", "finland", 
-                   "belgium", "austria", "switzerland", "ireland", "greece", "czech_republic"],
-        "Asia": ["china", "india", "south_korea", "thailand", "vietnam", "indonesia", "malaysia", 
-                 "philippines", "taiwan"],
-        "Middle East": ["uae", "saudi_arabia", "israel", "turkey"],
-        "Africa": ["south_africa", "nigeria", "kenya", "egypt", "morocco"],
-        "Latin America": ["argentina", "chile", "colombia", "peru", "costa_rica", "panama"],
-        "Oceania": ["new_zealand"]
-    }
-    
-    for region, countries in regions.items():
+    for region, countries in REGIONS.items():
         lines.append(f"\n# {region}")
         for country in countries:
             country_name = COUNTRIES[country]["name"]
-            lines.append(f"'{country}': 'rules/international/{country}.json',  # {country_name}")
+            lines.append(f"'{country}': ('rules/international/index.json', '{country}'),  # {country_name}")
     
     return "\n".join(lines)
 
@@ -158,7 +183,12 @@ if __name__ == "__main__":
     print("🌍 FairProp Global Rule Generator")
     print("=" * 50)
     
-    count = generate_all_countries()
+    parser = argparse.ArgumentParser(description="Generate international rule files")
+    parser.add_argument("--split", action="store_true", help="also write one file per country")
+    parser.add_argument("--pretty", action="store_true", help="also write indented .pretty.json copies")
+    args = parser.parse_args()
+    
+    count = generate_all_countries(split=args.split, pretty=args.pretty)
     
     print("\n" + "=" * 50)
     print(f"✅ Generated rules for {count} countries")
@@ -1,41 +1,44 @@
 """
 Auto-generate state-specific rule files based on protection categories.
-This script creates JSON rule files for all 50 US states + DC.
+This script creates the rules index for all 50 US states + DC,
+rules/us_states/index.json; pass --split to also write one file per state.
 """
 
-import json
+import argparse
 import os
 
-# State categorization
-SOURCE_OF_INCOME_STATES = [
+from json_io import dumps, write_file
+
+# State categorization; sets, since they are only used for membership tests
+SOURCE_OF_INCOME_STATES = frozenset({
     'california', 'colorado', 'connecticut', 'delaware', 'dc', 'illinois',
     'maine', 'maryland', 'massachusetts', 'minnesota', 'new_jersey', 'new_york',
     'north_dakota', 'oklahoma', 'oregon', 'utah', 'vermont', 'washington'
-]
+})
 
-LGBTQ_PROTECTION_STATES = [
+LGBTQ_PROTECTION_STATES = frozenset({
     'california', 'colorado', 'connecticut', 'delaware', 'dc', 'hawaii',
     'illinois', 'iowa', 'maine', 'maryland', 'massachusetts', 'minnesota',
     'nevada', 'new_hampshire', 'new_jersey', 'new_mexico', 'new_york',
     'oregon', 'rhode_island', 'utah', 'vermont', 'virginia', 'washington', 'wisconsin'
-]
+})
 
-MARITAL_STATUS_STATES = [
+MARITAL_STATUS_STATES = frozenset({
     'alaska', 'california', 'colorado', 'connecticut', 'delaware', 'dc',
     'hawaii', 'illinois', 'iowa', 'maine', 'maryland', 'massachusetts',
     'michigan', 'minnesota', 'montana', 'new_hampshire', 'new_jersey',
     'new_york', 'north_dakota', 'oregon', 'vermont', 'washington', 'wisconsin'
-]
+})
 
-MILITARY_VETERAN_STATES = [
+MILITARY_VETERAN_STATES = frozenset({
     'alaska', 'california', 'colorado', 'connecticut', 'delaware', 'iowa',
     'maine', 'massachusetts', 'new_mexico', 'ohio', 'oregon', 'virginia'
-]
+})
 
-AGE_PROTECTION_STATES = [
+AGE_PROTECTION_STATES = frozenset({
     'alaska', 'massachusetts', 'michigan', 'new_york', 'pennsylvania',
     'rhode_island', 'wisconsin'
-]
+})
 
 ALL_STATES = [
     'alabama', 'alaska', 'arizona', 'arkansas', 'california', 'colorado',
@@ -50,84 +53,91 @@ ALL_STATES = [
     'west_virginia', 'wisconsin', 'wyoming', 'dc'
 ]
 
-def generate_state_rules(state_name):
-    """Generate rules for a specific state."""
-    rules = []
-    state_lower = state_name.lower().replace(' ', '_')
-    state_display = state_name.title()
-    
+# (file/set key, display name, id prefix) per state, computed once
+STATE_TABLE = [(state, state.title(), state.upper()) for state in ALL_STATES]
+
+def _template(states, code, category, trigger_words, severity, basis, suggestion):
+    """A protection's rule with its fixed fields filled in, plus the parts each state completes."""
+    # Placeholders keep the key order of the written files
+    rule = {
+        "id": None,
+        "category": None,
+        "trigger_words": trigger_words,
+        "severity": severity,
+        "legal_basis": None,
+        "suggestion": suggestion
+    }
+    return states, rule, f"-{code}-001", f"{category} (", f" Fair Housing Law - {basis}"
+
+# (states, partial rule, id suffix, category prefix, legal basis suffix) per protection
+_PROTECTION_TEMPLATES = [
     # Source of Income
-    if state_lower in SOURCE_OF_INCOME_STATES:
-        rules.append({
-            "id": f"{state_lower.upper()}-SOI-001",
-            "category": f"Source of Income ({state_display})",
-            "trigger_words": ["no section 8", "no vouchers", "no housing assistance", "employment income only"],
-            "severity": "Critical",
-            "legal_basis": f"{state_display} Fair Housing Law - Source of Income Protection",
-            "suggestion": "Must accept all lawful sources of income including housing vouchers."
-        })
-    
+    _template(SOURCE_OF_INCOME_STATES, "SOI", "Source of Income",
+              ["no section 8", "no vouchers", "no housing assistance", "employment income only"],
+              "Critical", "Source of Income Protection",
+              "Must accept all lawful sources of income including housing vouchers."),
     # LGBTQ+ Protection
-    if state_lower in LGBTQ_PROTECTION_STATES:
-        rules.append({
-            "id": f"{state_lower.upper()}-LGBTQ-001",
-            "category": f"Sexual Orientation/Gender Identity ({state_display})",
-            "trigger_words": ["traditional family", "no lgbtq", "straight only", "gender at birth"],
-            "severity": "Critical",
-            "legal_basis": f"{state_display} Fair Housing Law - Sexual Orientation & Gender Identity",
-            "suggestion": "Cannot discriminate based on sexual orientation or gender identity."
-        })
-    
+    _template(LGBTQ_PROTECTION_STATES, "LGBTQ", "Sexual Orientation/Gender Identity",
+              ["traditional family", "no lgbtq", "straight only", "gender at birth"],
+              "Critical", "Sexual Orientation & Gender Identity",
+              "Cannot discriminate based on sexual orientation or gender identity."),
     # Marital Status
-    if state_lower in MARITAL_STATUS_STATES:
-        rules.append({
-            "id": f"{state_lower.upper()}-MARITAL-001",
-            "category": f"Marital Status ({state_display})",
-            "trigger_words": ["married couples only", "no single parents", "traditional marriage"],
-            "severity": "Warning",
-            "legal_basis": f"{state_display} Fair Housing Law - Marital Status Protection",
-            "suggestion": "Cannot discriminate based on marital status."
-        })
-    
+    _template(MARITAL_STATUS_STATES, "MARITAL", "Marital Status",
+              ["married couples only", "no single parents", "traditional marriage"],
+              "Warning", "Marital Status Protection",
+              "Cannot discriminate based on marital status."),
     # Military/Veteran
-    if state_lower in MILITARY_VETERAN_STATES:
-        rules.append({
-            "id": f"{state_lower.upper()}-VETERAN-001",
-            "category": f"Military/Veteran Status ({state_display})",
-            "trigger_words": ["no military", "civilian only", "non-veteran preferred"],
-            "severity": "Critical",
-            "legal_basis": f"{state_display} Fair Housing Law - Military Status Protection",
-            "suggestion": "Cannot discriminate based on military or veteran status."
-        })
-    
+    _template(MILITARY_VETERAN_STATES, "VETERAN", "Military/Veteran Status",
+              ["no military", "civilian only", "non-veteran preferred"],
+              "Critical", "Military Status Protection",
+              "Cannot discriminate based on military or veteran status."),
     # Age Protection
-    if state_lower in AGE_PROTECTION_STATES:
-        rules.append({
-            "id": f"{state_lower.upper()}-AGE-001",
-            "category": f"Age ({state_display})",
-            "trigger_words": ["young professionals only", "retirees preferred", "over 50", "under 30"],
-            "severity": "Warning",
-            "legal_basis": f"{state_display} Fair Housing Law - Age Discrimination",
-            "suggestion": "Cannot discriminate based on age unless qualified senior housing."
-        })
+    _template(AGE_PROTECTION_STATES, "AGE", "Age",
+              ["young professionals only", "retirees preferred", "over 50", "under 30"],
+              "Warning", "Age Discrimination",
+              "Cannot discriminate based on age unless qualified senior housing."),
+]
+
+def generate_state_rules(state_lower, state_display, state_id):
+    """Generate rules for a specific state, given its STATE_TABLE entry."""
+    rules = []
+    for states, template, id_suffix, category_prefix, basis_suffix in _PROTECTION_TEMPLATES:
+        if state_lower in states:
+            rule = template.copy()
+            rule["id"] = state_id + id_suffix
+            rule["category"] = f"{category_prefix}{state_display})"
+            rule["legal_basis"] = state_display + basis_suffix
+            rules.append(rule)
     
     return rules
 
 def main():
-    """Generate all state rule files."""
+    """Generate the state rules index, and per-state files with --split."""
+    parser = argparse.ArgumentParser(description="Generate US state rule files")
+    parser.add_argument("--split", action="store_true", help="also write one file per state")
+    args = parser.parse_args()
+    
     output_dir = "rules/us_states"
     os.makedirs(output_dir, exist_ok=True)
     
-    for state in ALL_STATES:
-        rules = generate_state_rules(state)
-        
-        if rules:  # Only create file if state has unique protections
-            filename = f"{output_dir}/{state.lower()}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(rules, f, indent=2, ensure_ascii=False)
-            print(f"Created {filename} with {len(rules)} rules")
+    # Only states with unique protections get an entry; the rest are federal only
+    index = {}
+    for state, state_display, state_id in STATE_TABLE:
+        rules = generate_state_rules(state, state_display, state_id)
+        if rules:
+            index[state] = rules
         else:
             print(f"Skipped {state} (federal only)")
+    
+    filename = f"{output_dir}/index.json"
+    write_file(filename, dumps(index, indent=True))
+    print(f"Created {filename} with {sum(map(len, index.values()))} rules for {len(index)} states")
+    
+    if args.split:
+        for state, rules in index.items():
+            filename = f"{output_dir}/{state}.json"
+            write_file(filename, dumps(rules, indent=True))
+            print(f"Created {filename} with {len(rules)} rules")
 
 if __name__ == "__main__":
     main()
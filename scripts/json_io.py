@@ -0,0 +1,38 @@
+"""
+JSON helpers shared by the rule generation scripts.
+
+orjson is used when installed; the stdlib fallback writes the same bytes
+for the rule data these scripts produce (dicts, lists, strings, ints).
+"""
+import json
+import os
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def loads(data: bytes):
+    """Parse JSON bytes, preferring orjson."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=False) -> bytes:
+    """Compact, or with indent=True 2-space indented, UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def write_file(path, data: bytes):
+    """Write data to path with raw os.write calls, skipping the buffered file object."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
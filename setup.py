@@ -26,10 +26,16 @@ setup(
         "opencv-python-headless",
         "numpy",
         "fastapi",
-        "uvicorn",
+        "uvicorn[standard]",
         "pydantic",
         "httpx",
     ],
+    extras_require={
+        # Optional accelerators, picked up automatically when installed
+        "fast": ["hyperscan", "pyahocorasick"],
+        # zstd-packed audit logs (AuditTrail(compress=True))
+        "compress": ["zstandard"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
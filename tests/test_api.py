@@ -1,8 +1,16 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
-from api_server import app
+from api_server import app, UsageStats, SCAN_CACHE_MAX_CHARS, _scan_cached
 
-client = TestClient(app)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Serve requests on uvloop when present, as uvicorn does in production
+client = TestClient(app, backend_options={"use_uvloop": HAS_UVLOOP})
 
 
 class TestAPIEndpoints:
@@ -63,6 +71,21 @@ class TestAPIEndpoints:
         assert 'total_scanned' in data
         assert data['total_scanned'] == 2
     
+    def test_batch_scan_preserves_order(self):
+        """Test that grouped batch results come back in request order."""
+        items = [
+            {"text": "Adults only building.", "jurisdictions": ["california"], "use_cache": False},
+            {"text": "Sunny studio near the park.", "jurisdictions": []},
+            {"text": "No kids allowed.", "jurisdictions": []},
+            {"text": "Adults only building.", "jurisdictions": ["california"], "use_cache": False},
+        ] * 10
+        response = client.post("/api/scan/batch", json={"items": items})
+        assert response.status_code == 200
+        
+        results = response.json()['results']
+        expected = [client.post("/api/scan", json=item).json() for item in items[:4]] * 10
+        assert results == expected
+    
     def test_reload_rules(self):
         """Test rule reload endpoint."""
         response = client.post("/api/reload-rules")
@@ -118,6 +141,112 @@ class TestCaching:
             "use_cache": False
         })
         assert response.status_code == 200
+    
+    def test_repeated_request_served_from_cache(self):
+        """Test that identical requests reuse the memoized report."""
+        payload = {"text": "Cozy loft, adults only.", "jurisdictions": ["NYC", "california"]}
+        first = client.post("/api/scan", json=payload).json()
+        hits = _scan_cached.cache_info().hits
+        
+        payload["jurisdictions"] = ["nyc", "California", "NYC"]
+        second = client.post("/api/scan", json=payload).json()
+        
+        assert second == first
+        assert _scan_cached.cache_info().hits == hits + 1
+        
+        # Texts over the limit are scanned every time and never kept
+        payload["text"] = "Cozy loft, adults only. " * (SCAN_CACHE_MAX_CHARS // 24 + 1)
+        info = _scan_cached.cache_info()
+        assert client.post("/api/scan", json=payload).json() == client.post("/api/scan", json=payload).json()
+        assert client.post("/api/scan/batch", json={"items": [payload]}).status_code == 200
+        assert _scan_cached.cache_info()[:2] == info[:2]
+    
+    def test_flags_follow_jurisdiction_order(self):
+        """Test that jurisdiction flags come back in the order the request lists them."""
+        text = "No Section 8. Adults only."
+        for jurisdictions, prefixes in ((["nyc", "california"], ["NYC", "CA"]), (["california", "nyc"], ["CA", "NYC"])):
+            items = client.post("/api/scan", json={"text": text, "jurisdictions": jurisdictions}).json()['flagged_items']
+            local = [item['id'].split('-')[0] for item in items if item['id'].split('-')[0] in prefixes]
+            assert list(dict.fromkeys(local)) == prefixes
+
+
+class TestCompression:
+    """Test response compression."""
+    
+    def test_large_batch_is_gzipped(self):
+        """Test that large responses are compressed and small ones are not."""
+        items = [{"text": "No kids allowed. Christians only."}] * 20
+        response = client.post("/api/scan/batch", json={"items": items},
+                               headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.json()['total_scanned'] == 20
+        
+        # Decodes to the same results as the uncompressed body, at most half its size
+        plain = client.post("/api/scan/batch", json={"items": items},
+                            headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert response.json()['results'] == plain.json()['results']
+        assert int(response.headers["content-length"]) * 2 <= int(plain.headers["content-length"])
+        
+        response = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+class TestUsageStats:
+    """Test incremental usage statistics."""
+    
+    def _append(self, path, *is_safe):
+        with open(path, 'a', encoding='utf-8') as f:
+            for safe in is_safe:
+                f.write(json.dumps({"endpoint": "/api/scan", "response": {"is_safe": safe}}) + "\n")
+    
+    def test_counts_only_new_entries(self, tmp_path):
+        """Test that refresh picks up appended entries and ignores partial lines."""
+        log = tmp_path / "api_usage.jsonl"
+        stats = UsageStats(log, tmp_path / "stats.json")
+        assert stats.refresh() == (0, 0)
+        
+        self._append(log, True, False)
+        assert stats.refresh() == (2, 1)
+        
+        self._append(log, False)
+        with open(log, 'a', encoding='utf-8') as f:
+            f.write('{"endpoint": "/api/scan", "resp')
+        assert stats.refresh() == (3, 2)
+    
+    def test_compact_entries_counted_without_parsing(self, tmp_path):
+        """Test that writer-format lines give the same counts as parsing."""
+        log = tmp_path / "api_usage.jsonl"
+        entries = [
+            {"endpoint": "/api/scan", "request": {"jurisdictions": ['"is_safe":false']}, "response": {"is_safe": True}},
+            {"endpoint": "/api/scan", "request": {}, "response": {"is_safe": False}},
+            {"endpoint": "/api/scan/batch", "request": {}, "response": {"is_safe": None}},
+        ]
+        log.write_text("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries))
+        assert UsageStats(log, tmp_path / "stats.json").refresh() == (3, 2)
+    
+    def test_snapshot_resumes_from_offset(self, tmp_path):
+        """Test that a new instance resumes from the saved snapshot."""
+        log = tmp_path / "api_usage.jsonl"
+        snapshot = tmp_path / "stats.json"
+        self._append(log, True, False, False)
+        assert UsageStats(log, snapshot, snapshot_every=1).refresh() == (3, 2)
+        assert snapshot.exists()
+        
+        self._append(log, True)
+        assert UsageStats(log, snapshot).refresh() == (4, 2)
+    
+    def test_truncated_log_recounts(self, tmp_path):
+        """Test that a truncated log resets the counters."""
+        log = tmp_path / "api_usage.jsonl"
+        stats = UsageStats(log, tmp_path / "stats.json")
+        self._append(log, False, False)
+        assert stats.refresh() == (2, 2)
+        
+        log.write_text("")
+        self._append(log, True)
+        assert stats.refresh() == (1, 0)
 
 
 if __name__ == '__main__':
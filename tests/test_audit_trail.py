@@ -0,0 +1,301 @@
+import hashlib
+import io
+import json
+import uuid
+import pytest
+from fairprop import audit_trail
+from fairprop.audit_trail import AuditTrail, _canonical_json, _sha256_digest, _sha256_digests, _uuid4_str
+
+
+REPORT = {
+    "score": 75,
+    "is_safe": False,
+    "flagged_items": [
+        {"id": "FHA-FAM-001", "category": "Familial Status", "severity": "Critical", "found_word": "no kids"}
+    ]
+}
+
+
+@pytest.fixture
+def trail(tmp_path):
+    trail = AuditTrail(storage_dir=str(tmp_path / "audit_logs"))
+    yield trail
+    trail.close()
+
+
+class TestHashing:
+    """Test SHA-256 helpers."""
+    
+    def test_digest_matches_hashlib(self):
+        """Test that the selected backend agrees with hashlib."""
+        data = "Cozy studio, no kids allowed. ✓".encode('utf-8')
+        assert _sha256_digest(data) == hashlib.sha256(data).hexdigest()
+    
+    def test_copied_contexts_start_empty(self, trail):
+        """Test that hashers copied from the shared prototype don't carry state between uses."""
+        empty = hashlib.sha256(b"").hexdigest()
+        assert _sha256_digest(b"") == empty
+        assert trail._hash_text("") == empty
+        _sha256_digest(b"listing")
+        assert _sha256_digest(b"") == empty
+        assert audit_trail._SHA256_PROTO.hexdigest() == empty
+    
+    def test_hash_text_streams_all_input_types(self, trail, monkeypatch):
+        """Test that chunked str, bytes and file hashing match a one-shot hash."""
+        monkeypatch.setattr(audit_trail, "_HASH_CHUNK_CHARS", 7)
+        text = "Cozy studio — no kids allowed. 日本語 " * 5
+        expected = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        
+        assert trail._hash_text(text) == expected
+        assert trail._hash_text(text.encode('utf-8')) == expected
+        assert trail._hash_text(io.BytesIO(text.encode('utf-8'))) == expected
+    
+    def test_text_hash_cache(self, trail, monkeypatch):
+        """Test that repeated texts reuse their digest and the cache stays bounded."""
+        monkeypatch.setattr(audit_trail, "_TEXT_HASH_CACHE_SIZE", 2)
+        texts = ["Sunny loft.", "Cozy studio.", "Sunny loft.", "Quiet street."]
+        for text in texts:
+            assert trail._hash_text(text) == hashlib.sha256(text.encode('utf-8')).hexdigest()
+        assert list(trail._text_hashes) == ["Sunny loft.", "Quiet street."]
+        
+        long_text = "x" * (audit_trail._TEXT_HASH_MAX_CHARS + 1)
+        assert trail._hash_text(long_text) == hashlib.sha256(long_text.encode('utf-8')).hexdigest()
+        assert long_text not in trail._text_hashes
+        
+        records = trail.create_audit_records([{"text": text, "report": REPORT} for text in texts])
+        assert [r["text_hash"] for r in records] == [hashlib.sha256(t.encode('utf-8')).hexdigest() for t in texts]
+    
+    def test_batch_digests_match_serial(self, monkeypatch):
+        """Test that the threaded batch path returns digests in input order."""
+        monkeypatch.setattr(audit_trail, "_PARALLEL_HASH_MIN_BYTES", 0)
+        buffers = [bytes([i]) * (4096 + i) for i in range(8)]
+        assert _sha256_digests(buffers) == [hashlib.sha256(b).hexdigest() for b in buffers]
+
+
+class TestAuditIds:
+    """Test audit ID generation."""
+    
+    def test_ids_are_unique_uuid4_strings(self):
+        """Test that generated IDs round-trip as RFC 4122 version 4 UUIDs."""
+        ids = {_uuid4_str() for _ in range(200)}
+        assert len(ids) == 200
+        for audit_id in ids:
+            parsed = uuid.UUID(audit_id)
+            assert str(parsed) == audit_id
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+
+class TestAuditRecords:
+    """Test audit record creation, storage and verification."""
+    
+    def test_create_and_get_record(self, trail):
+        """Test that a stored record can be retrieved and verified."""
+        record = trail.create_audit_record("Cozy studio, no kids allowed.", REPORT, user_id="agent-1")
+        
+        assert record["text_hash"] == hashlib.sha256("Cozy studio, no kids allowed.".encode('utf-8')).hexdigest()
+        assert record["report"]["violations_count"] == 1
+        assert trail.verify_record(record)
+        assert trail.get_record(record["audit_id"]) == record
+    
+    def test_tampered_record_fails_verification(self, trail):
+        """Test that modifying a record invalidates its signature."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        record["report"]["score"] = 100
+        
+        assert not trail.verify_record(record)
+    
+    def test_malformed_signature_fails_verification(self, trail):
+        """Test that signatures which aren't hex digests are rejected, not raised on."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        assert trail._sign_record(record).hex() == record["signature"]
+        
+        for signature in ("zz" * 32, record["signature"][:-2], ""):
+            assert not trail.verify_record({**record, "signature": signature})
+    
+    def test_records_by_date_parallel(self, trail, monkeypatch):
+        """Test that verification spread over the thread pool returns every valid record."""
+        monkeypatch.setattr(audit_trail, "_VERIFY_CHUNK", 2)
+        records = trail.create_audit_records([{"text": f"Listing {i}", "report": REPORT} for i in range(7)])
+        
+        found = trail.get_records_by_date(records[0]["timestamp"][:10])
+        assert sorted(r["audit_id"] for r in found) == sorted(r["audit_id"] for r in records)
+    
+    def test_tampered_stored_record_is_rejected(self, trail, tmp_path):
+        """Test that edits to the stored bytes are caught on read."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        path = tmp_path / "audit_logs" / record["timestamp"][:10] / "audits.jsonl"
+        path.write_bytes(path.read_bytes().replace(b'"score":75', b'"score":99'))
+        
+        assert trail.get_record(record["audit_id"]) is None
+        assert trail.get_records_by_date(record["timestamp"][:10]) == []
+    
+    def test_get_record_without_verification(self, trail, tmp_path):
+        """Test that verify=False returns stored content without checking its signature."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        path = tmp_path / "audit_logs" / record["timestamp"][:10] / "audits.jsonl"
+        path.write_bytes(path.read_bytes().replace(b'"score":75', b'"score":99'))
+        
+        assert trail.get_record(record["audit_id"]) is None
+        unverified = trail.get_record(record["audit_id"], verify=False)
+        assert unverified["report"]["score"] == 99
+        assert not trail.verify_record(unverified)
+    
+    def test_records_by_date(self, trail):
+        """Test listing records for the day they were created."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        date = record["timestamp"][:10]
+        
+        assert [r["audit_id"] for r in trail.get_records_by_date(date)] == [record["audit_id"]]
+        assert trail.get_records_by_date("1999-01-01") == []
+    
+    def test_create_audit_records_batch(self, trail):
+        """Test that batch creation matches single-record creation."""
+        texts = ["Sunny loft.", "Cozy studio, no kids allowed.", ""]
+        records = trail.create_audit_records(
+            [{"text": t, "report": REPORT, "user_id": "agent-1"} for t in texts]
+        )
+        
+        assert [r["text_hash"] for r in records] == [trail._hash_text(t) for t in texts]
+        assert [r["text_length"] for r in records] == [len(t) for t in texts]
+        assert all(trail.verify_record(r) for r in records)
+        assert trail.get_record(records[1]["audit_id"]) == records[1]
+    
+    def test_stored_bytes_are_signed_form(self, trail, tmp_path):
+        """Test that the saved file is the canonical signed body plus signature."""
+        record = trail.create_audit_record("Sunny loft.", REPORT)
+        path = tmp_path / "audit_logs" / record["timestamp"][:10] / "audits.jsonl"
+        
+        raw = path.read_bytes()
+        assert raw.endswith(b"\n") and raw.count(b"\n") == 1
+        assert json.loads(raw) == record
+        assert raw.startswith(trail._canonical_bytes(record)[:-1])
+    
+    def test_canonical_json_edge_values(self, trail):
+        """Test that floats, non-str keys and big ints are signed and verify after a round trip."""
+        obj = {"b": [1, True, None], "a": {"z": "ünï\"code\n", "y": -3}, "c": "",
+               "f": [0.00001, 1e16, 0.1], "big": 2 ** 70}
+        assert _canonical_json(obj) == json.dumps(
+            obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+        
+        metadata = {**obj, "by_line": {7: "no kids", 3: "adults only"}}
+        record = trail.create_audit_record("Sunny loft.", REPORT, metadata=metadata)
+        stored = trail.get_record(record["audit_id"])
+        assert stored == json.loads(json.dumps(record))
+        assert stored["metadata"]["big"] == 2 ** 70
+        assert trail.verify_record(stored)
+    
+    def test_legacy_pretty_printed_record_still_verifies(self, trail, tmp_path):
+        """Test that records saved by older versions (indent=2) remain readable."""
+        record = trail._build_record("0" * 64, 0, REPORT, None, None)
+        record["version"] = "1.0.0"
+        record["signature"] = trail._sign_record(record).hex()
+        day_dir = tmp_path / "audit_logs" / "2025-01-01"
+        day_dir.mkdir()
+        (day_dir / f"{record['audit_id']}.json").write_text(json.dumps(record, indent=2))
+        
+        assert trail.get_record(record["audit_id"]) == record
+        
+        record["user_id"] = "mallory"
+        (day_dir / f"{record['audit_id']}.json").write_text(json.dumps(record, indent=2))
+        assert trail.get_record(record["audit_id"]) is None
+    
+    def test_get_record_uses_index_and_backfills(self, trail, tmp_path):
+        """Test that indexed lookups skip the directory walk and old records get indexed."""
+        first = trail.create_audit_record("Sunny loft.", REPORT)
+        record = trail.create_audit_record("Cozy studio.", REPORT)
+        location = trail._indexed_location(record["audit_id"])
+        assert location[0] == record["timestamp"][:10] and location[1] > 0
+        
+        with trail._index:
+            trail._index.execute("DELETE FROM idx")
+        assert trail.get_record(record["audit_id"]) == record
+        assert trail._indexed_location(record["audit_id"]) == location
+        assert trail.get_record(first["audit_id"]) == first
+        assert trail.get_record("missing-id") is None
+    
+    def test_batched_writes(self, tmp_path):
+        """Test that batched records are written together and readable once flushed."""
+        trail = AuditTrail(storage_dir=str(tmp_path / "batched"), batch_size=3, flush_interval=0)
+        try:
+            records = [trail.create_audit_record(f"Listing {i}", REPORT) for i in range(4)]
+            log_path = tmp_path / "batched" / records[0]["timestamp"][:10] / "audits.jsonl"
+            assert log_path.read_bytes().count(b"\n") == 3
+            
+            assert trail.get_record(records[3]["audit_id"]) == records[3]
+            assert log_path.read_bytes().count(b"\n") == 4
+            assert len(trail.get_records_by_date(records[0]["timestamp"][:10])) == 4
+        finally:
+            trail.close()
+    
+    @pytest.mark.skipif(not audit_trail.HAS_ZSTD, reason="zstandard not installed")
+    def test_compressed_log(self, tmp_path):
+        """Test that zstd-packed records are found through the index, by walking, and by date."""
+        trail = AuditTrail(storage_dir=str(tmp_path / "packed"), batch_size=3, flush_interval=0, compress=True)
+        try:
+            records = [trail.create_audit_record(f"Listing {i}", REPORT) for i in range(5)]
+            trail.flush()
+            day_dir = tmp_path / "packed" / records[0]["timestamp"][:10]
+            assert not (day_dir / "audits.jsonl").exists()
+            
+            assert trail.get_record(records[4]["audit_id"]) == records[4]
+            location = trail._indexed_location(records[1]["audit_id"])
+            assert location[3] and location[1] == 0
+            with trail._index:
+                trail._index.execute("DELETE FROM idx")
+            assert trail.get_record(records[1]["audit_id"]) == records[1]
+            assert trail._indexed_location(records[1]["audit_id"]) == location
+            assert sorted(r["audit_id"] for r in trail.get_records_by_date(records[0]["timestamp"][:10])) == \
+                sorted(r["audit_id"] for r in records)
+        finally:
+            trail.close()
+    
+    def test_fsync_appends(self, tmp_path, monkeypatch):
+        """Test that fsync=True flushes each appended batch and records stay readable."""
+        synced = []
+        real_fsync = audit_trail.os.fsync
+        monkeypatch.setattr(audit_trail.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+        trail = AuditTrail(storage_dir=str(tmp_path / "durable"), fsync=True)
+        try:
+            records = [trail.create_audit_record(f"Listing {i}", REPORT) for i in range(2)]
+            assert len(synced) == 2
+            assert [trail.get_record(r["audit_id"]) for r in records] == records
+        finally:
+            trail.close()
+    
+    def test_compress_without_zstandard_writes_plain(self, tmp_path, monkeypatch):
+        """Test that asking for compression without zstandard keeps plain JSONL logs."""
+        monkeypatch.setattr(audit_trail, "HAS_ZSTD", False)
+        trail = AuditTrail(storage_dir=str(tmp_path / "plain"), compress=True)
+        try:
+            record = trail.create_audit_record("Sunny loft.", REPORT)
+            assert (tmp_path / "plain" / record["timestamp"][:10] / "audits.jsonl").exists()
+            assert trail.get_record(record["audit_id"]) == record
+        finally:
+            trail.close()
+    
+    @pytest.mark.skipif(not audit_trail.HAS_FPDF, reason="fpdf2 not installed")
+    def test_certificates_share_template(self, trail, tmp_path):
+        """Test that certificates are drawn on copies, leaving the shared template untouched."""
+        passing = trail.create_audit_record("Sunny loft.", {"score": 100, "is_safe": True, "flagged_items": []})
+        failing = trail.create_audit_record("No kids.", REPORT)
+        pages = audit_trail._certificate_template().pages[1].contents
+        
+        for record in (passing, failing):
+            path = trail.generate_compliance_certificate(record["audit_id"], str(tmp_path / f"{record['audit_id']}.pdf"))
+            assert open(path, "rb").read(5) == b"%PDF-"
+        assert audit_trail._certificate_template().pages[1].contents == pages
+    
+    @pytest.mark.skipif(not audit_trail.HAS_FPDF, reason="fpdf2 not installed")
+    def test_submit_certificate_renders_in_pool(self, trail, tmp_path):
+        """Test that certificates submitted to the process pool resolve to written PDFs."""
+        records = [trail.create_audit_record(f"Listing {i}", REPORT) for i in range(3)]
+        futures = [
+            trail.submit_compliance_certificate(r["audit_id"], str(tmp_path / f"{r['audit_id']}.pdf"))
+            for r in records
+        ]
+        for record, future in zip(records, futures):
+            path = future.result(timeout=60)
+            assert path == str(tmp_path / f"{record['audit_id']}.pdf")
+            assert open(path, "rb").read(5) == b"%PDF-"
+        assert trail.submit_compliance_certificate("missing-id").result() is None
@@ -1,3 +1,5 @@
+import json
+import os
 import pytest
 from fairprop import FairHousingAuditor
 
@@ -67,6 +69,40 @@ class TestJurisdictions:
         auditor = FairHousingAuditor(jurisdictions=['uk'])
         assert len(auditor.rules) > 0
 
+    def test_country_rules_read_from_index(self, tmp_path):
+        """Test that generated countries are loaded from their entry in the shared index."""
+        federal = [{"id": "FHA-1", "category": "Race", "trigger_words": ["whites only"],
+                    "severity": "Critical", "legal_basis": "FHA", "suggestion": "Remove it."}]
+        spain = [{**federal[0], "id": "SPAIN-RACE-001"}]
+        korea = [{**federal[0], "id": "SOUTH_KOREA-RACE-001"}]
+        (tmp_path / "rules" / "international").mkdir(parents=True)
+        (tmp_path / "rules" / "international" / "index.json").write_text(
+            json.dumps({"spain": spain, "south_korea": korea}), encoding="utf-8")
+        rules_path = tmp_path / "fha_rules.json"
+        rules_path.write_text(json.dumps(federal), encoding="utf-8")
+
+        auditor = FairHousingAuditor(rules_path=str(rules_path), jurisdictions=['spain', 'korea', 'peru'])
+
+        assert [rule["id"] for rule in auditor.rules] == ["FHA-1", "SPAIN-RACE-001", "SOUTH_KOREA-RACE-001"]
+
+    def test_state_rules_read_from_index(self, tmp_path):
+        """Test that generated states are loaded from the state index, and DC from its own file."""
+        federal = [{"id": "FHA-1", "category": "Race", "trigger_words": ["whites only"],
+                    "severity": "Critical", "legal_basis": "FHA", "suggestion": "Remove it."}]
+        oregon = [{**federal[0], "id": "OREGON-SOI-001"}]
+        dc = [{**federal[0], "id": "DC-HRL-001"}]
+        states_dir = tmp_path / "rules" / "us_states"
+        states_dir.mkdir(parents=True)
+        (states_dir / "index.json").write_text(
+            json.dumps({"oregon": oregon, "dc": [{**federal[0], "id": "DC-SOI-001"}]}), encoding="utf-8")
+        (states_dir / "dc.json").write_text(json.dumps(dc), encoding="utf-8")
+        rules_path = tmp_path / "fha_rules.json"
+        rules_path.write_text(json.dumps(federal), encoding="utf-8")
+
+        auditor = FairHousingAuditor(rules_path=str(rules_path), jurisdictions=['oregon', 'dc', 'alabama'])
+
+        assert [rule["id"] for rule in auditor.rules] == ["FHA-1", "OREGON-SOI-001", "DC-HRL-001"]
+
 
 class TestCaching:
     """Test caching functionality."""
@@ -86,6 +122,15 @@ class TestCaching:
         assert report1['score'] == report2['score']
         assert len(report1['flagged_items']) == len(report2['flagged_items'])
     
+    def test_cache_is_per_auditor(self):
+        """Test that cached reports are not shared between auditors for different jurisdictions."""
+        federal = FairHousingAuditor()
+        california = FairHousingAuditor(jurisdictions=['california'])
+        text = "Section 8 vouchers not accepted."
+        
+        assert federal.scan_text(text) is federal.scan_text(text)
+        assert california.scan_text(text) is not federal.scan_text(text)
+    
     def test_cache_bypass(self):
         """Test that cache can be bypassed."""
         auditor = FairHousingAuditor()
@@ -94,6 +139,17 @@ class TestCaching:
         # Scan without cache
         report = auditor.scan_text(text, use_cache=False)
         assert report is not None
+    
+    def test_scan_texts_matches_scan_text(self):
+        """Test that bulk scanning returns one matching report per text."""
+        auditor = FairHousingAuditor()
+        texts = ["No kids allowed.", "Sunny studio near the park.", "No kids allowed."]
+        
+        reports = auditor.scan_texts(texts, use_cache=False)
+        
+        assert len(reports) == 3
+        assert reports == [auditor.scan_text(t, use_cache=False) for t in texts]
+        assert reports[0] is reports[2]
 
 
 class TestRuleReload:
@@ -109,6 +165,41 @@ class TestRuleReload:
         assert 'old_count' in result
         assert 'new_count' in result
         assert result['old_count'] == initial_count
+    
+    def test_reload_picks_up_changed_file(self, tmp_path):
+        """Test that edited rule files are re-parsed while unchanged ones are reused."""
+        rules_file = tmp_path / "rules.json"
+        rule = {"id": "T-1", "category": "Test", "trigger_words": ["zebra"],
+                "severity": "Warning", "legal_basis": "n/a", "suggestion": "n/a"}
+        rules_file.write_text(json.dumps([rule]), encoding='utf-8')
+        
+        auditor = FairHousingAuditor(rules_path=str(rules_file))
+        assert FairHousingAuditor(rules_path=str(rules_file)).rules == auditor.rules
+        assert auditor.scan_text("zebra crossing", use_cache=False)['flagged_items']
+        
+        rules_file.write_text(json.dumps([rule, dict(rule, id="T-2")]), encoding='utf-8')
+        os.utime(rules_file, ns=(0, 10**9))
+        result = auditor.reload_rules()
+        
+        assert result == {"old_count": 1, "new_count": 2}
+    
+    def test_auditors_share_compiled_matchers(self, tmp_path):
+        """Test that auditors over the same rules share keyword matchers until the rules change."""
+        rules_file = tmp_path / "rules.json"
+        rule = {"id": "T-1", "category": "Test", "trigger_words": ["zebra"],
+                "severity": "Warning", "legal_basis": "n/a", "suggestion": "n/a"}
+        rules_file.write_text(json.dumps([rule]), encoding='utf-8')
+        
+        first = FairHousingAuditor(rules_path=str(rules_file))
+        second = FairHousingAuditor(rules_path=str(rules_file))
+        assert second._keyword_rules is first._keyword_rules
+        
+        rules_file.write_text(json.dumps([dict(rule, trigger_words=["giraffe"])]), encoding='utf-8')
+        os.utime(rules_file, ns=(0, 10**9))
+        second.reload_rules()
+        assert second._keyword_rules is not first._keyword_rules
+        assert second.scan_text("giraffe crossing", use_cache=False)['flagged_items']
+        assert not first.scan_text("giraffe crossing", use_cache=False)['flagged_items']
 
 
 class TestEdgeCases:
@@ -140,6 +231,130 @@ class TestEdgeCases:
         assert report is not None
 
 
+    def test_ascii_tokenizer_matches_unicode(self):
+        """Test that the ASCII word pattern splits lowered ASCII text exactly like \\w+."""
+        import re
+        from fairprop import auditor as auditor_module
+        for text in ["no_kids 2br, 3-bed adults only!", "\u212aids welcome".lower()]:
+            assert text.isascii()
+            assert auditor_module._ASCII_WORD_RE.findall(text) == re.findall(r'\w+', text)
+    
+    def test_sentence_pattern_matches_split(self):
+        """Test that sentence runs are the non-empty pieces of splitting on delimiters."""
+        import re
+        from fairprop import auditor as auditor_module
+        text = "Sunny unit.. Close to transit!\n\nNo pets?  Quiet street. "
+        pieces = [s for s in re.split(r'[.!?\n]', text) if s]
+        assert [m.group() for m in auditor_module._SENTENCE_RE.finditer(text)] == pieces
+    
+    def test_overlapping_triggers_all_found(self):
+        """Test that the phrase matcher reports every trigger occurring in the text, overlaps included."""
+        auditor = FairHousingAuditor()
+        text = "no children, no kids under 5. adults only; christian home"
+        triggers = {t[1] for _, trs in auditor._keyword_rules for t in trs if t[1]}
+        
+        found = auditor._matched_phrases(text)
+        assert found is not None
+        assert found - {""} == {t for t in triggers if t in text}
+
+    
+    def test_batched_fuzzy_hits_match_pairwise(self):
+        """Test that batched fuzzy scoring picks the same first word as checking pairs in order."""
+        from fairprop import auditor as auditor_module
+        if not auditor_module.HAS_RAPIDFUZZ:
+            pytest.skip("rapidfuzz not installed")
+        auditor = FairHousingAuditor()
+        words = ["sunny", "caucasain", "caucasian", "atheists", "bachelr", "affluentt"]
+        
+        expected = {}
+        for trigger in auditor._fuzzy_triggers:
+            word = next((w for w in words if auditor._fuzzy_match(trigger, w)), None)
+            if word is not None:
+                expected[trigger] = word
+        assert expected
+        assert auditor._fuzzy_hits(words) == expected
+
+    
+    def test_neural_flag_stops_at_first_flagged_batch(self, monkeypatch):
+        """Test that the guardrail flags the first discriminatory sentence and skips later batches."""
+        from fairprop import auditor as auditor_module
+        monkeypatch.setattr(auditor_module, "GUARDRAIL_BATCH_SIZE", 2)
+        auditor = FairHousingAuditor()
+        batches = []
+        
+        def classify_intent(sentences, labels):
+            batches.append(list(sentences))
+            return [{"labels": ["exclusionary" if "only" in s else "welcoming"] + labels[1:], "scores": [0.9]}
+                    for s in sentences]
+        
+        monkeypatch.setattr(auditor.model_manager, "classify_intent", classify_intent)
+        sentences = ["Sunny two bedroom", "Close to the park", "Quiet tenants only", "Mature trees", "Garage"]
+        flag = auditor._neural_flag(sentences)
+        
+        assert flag["found_word"] == "Quiet tenants only..."
+        assert batches == [sentences[:2], sentences[2:4]]
+    
+    def test_semantic_hit_uses_first_rule_with_id(self, monkeypatch):
+        """Test that semantic hits resolve to the first loaded rule carrying the matched id."""
+        auditor = FairHousingAuditor()
+        base = {"category": "Test", "trigger_words": ["zebra"], "severity": "Warning",
+                "legal_basis": "n/a", "suggestion": "first"}
+        auditor.rules = [dict(base, id="T-1"), dict(base, id="T-1", suggestion="second")]
+        monkeypatch.setattr(auditor.model_manager, "_has_ai", True)
+        monkeypatch.setattr(type(auditor.model_manager), "guardrail_pipeline", None)
+        monkeypatch.setattr(auditor, "_nearest_triggers", lambda sentences: [(0.99, {"rule_id": "T-1"}, "zebra")])
+        
+        report = auditor.scan_text("A striped horse lives here", use_cache=False)
+        assert [item["suggestion"] for item in report["flagged_items"]] == ["first (Detected via semantic analysis)"]
+    
+    def test_early_exit_skips_ai_layers_for_unsafe_listings(self, monkeypatch):
+        """Test that early exit keeps the verdict and skips the AI layers only once the listing fails."""
+        auditor = FairHousingAuditor()
+        monkeypatch.setattr(auditor.model_manager, "_has_ai", True)
+        monkeypatch.setattr(type(auditor.model_manager), "guardrail_pipeline", None)
+        semantic_calls = []
+        monkeypatch.setattr(auditor, "_nearest_triggers", lambda sentences: semantic_calls.append(sentences) or [None] * len(sentences))
+        
+        unsafe = "No children allowed in this lovely building."
+        full = auditor.scan_text(unsafe, use_cache=False)
+        assert auditor.scan_text(unsafe, early_exit=True) == full
+        assert len(semantic_calls) == 1
+        
+        auditor.scan_text("Lovely building with a sunny garden.", early_exit=True)
+        assert len(semantic_calls) == 2
+    
+    def test_flags_follow_rule_and_trigger_order(self):
+        """Test that each rule is flagged on its first matching trigger and each id only once."""
+        from fairprop import auditor as auditor_module
+        if not auditor_module.HAS_RAPIDFUZZ:
+            pytest.skip("rapidfuzz not installed")
+        auditor = FairHousingAuditor()
+        base = {"category": "Test", "severity": "Warning", "legal_basis": "n/a", "suggestion": "n/a"}
+        auditor.rules = [
+            dict(base, id="B", trigger_words=["zebra", "lion"]),
+            dict(base, id="A", trigger_words=["Giraffe crossing", "zebra"]),
+            dict(base, id="B", trigger_words=["lion"]),
+        ]
+        
+        report = auditor.scan_text("A lion and a zbra near the giraffe crossing", use_cache=False)
+        assert [(item["id"], item["found_word"]) for item in report["flagged_items"]] == [
+            ("B", "zbra"), ("A", "Giraffe crossing")
+        ]
+    
+    def test_trie_pattern_cached_on_disk(self, tmp_path, monkeypatch):
+        """Test that the compiled phrase pattern is reused from disk and matches the built one."""
+        from fairprop import auditor as auditor_module
+        monkeypatch.setenv("FAIRPROP_CACHE_DIR", str(tmp_path))
+        phrases = ["adults only", "no kids", "no kids under"]
+        
+        built = auditor_module._cached_trie_pattern(phrases)
+        assert built == auditor_module._trie_pattern(phrases)
+        assert len(list(tmp_path.iterdir())) == 1
+        
+        monkeypatch.setattr(auditor_module, "_trie_pattern", lambda _phrases: pytest.fail("rebuilt"))
+        assert auditor_module._cached_trie_pattern(phrases) == built
+
+
 class TestSeverityLevels:
     """Test different severity levels."""
     
@@ -184,5 +399,39 @@ class TestLanguageSupport:
         assert auditor.language == 'es'
 
 
+
+class TestImageScanning:
+    """Test scanning text and logos in images."""
+    
+    def test_logo_detection_overlaps_ocr(self, tmp_path, monkeypatch):
+        """Test that logo detection runs while OCR is still in progress."""
+        import threading
+        from types import SimpleNamespace
+        Image = pytest.importorskip("PIL.Image")
+        from fairprop import auditor as auditor_module
+        image_path = tmp_path / "listing.png"
+        Image.new("RGB", (8, 8), "white").save(image_path)
+        logo_started = threading.Event()
+        
+        def image_to_string(_image):
+            # Only returns if logo detection started before OCR finished
+            assert logo_started.wait(5)
+            return "No children allowed."
+        
+        def detect_logo(_image):
+            logo_started.set()
+            return {"found": True}
+        
+        monkeypatch.setattr(auditor_module, "HAS_OCR", True)
+        monkeypatch.setattr(auditor_module, "Image", Image, raising=False)
+        monkeypatch.setattr(auditor_module, "pytesseract", SimpleNamespace(image_to_string=image_to_string), raising=False)
+        auditor = FairHousingAuditor()
+        monkeypatch.setattr(auditor, "_detect_logo", detect_logo)
+        
+        result = auditor.scan_image(str(image_path))
+        assert result["logo_detection"] == {"found": True}
+        assert result["report"]["flagged_items"]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
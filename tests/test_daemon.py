@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+import time
+
+import pytest
+from fairprop import FairHousingAuditor, daemon
+
+pytestmark = pytest.mark.skipif(not daemon.HAS_UNIX_SOCKETS, reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Path of a daemon running in a background thread for the test."""
+    path = str(tmp_path / "fairprop.sock")
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(daemon.ScanServer().serve(path))
+    thread = threading.Thread(target=loop.run_until_complete, args=(task,))
+    thread.start()
+    for _ in range(100):
+        if daemon.daemon_running(path):
+            break
+        time.sleep(0.05)
+    yield path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    loop.close()
+
+
+class TestDaemon:
+    """Test scanning through a warm daemon."""
+
+    def test_daemon_matches_in_process_scan(self, socket_path):
+        """Test that a daemon reports exactly what an in-process auditor does."""
+        text = "No children allowed. Christians preferred."
+        expected = FairHousingAuditor(jurisdictions=['california']).scan_text(text)
+
+        assert daemon.request_scan(text, "fha_rules.json", ['california'], socket_path) == expected
+        assert daemon.request_scan(text, "fha_rules.json", ['california'], socket_path) == expected
+
+    def test_daemon_errors_are_raised(self, socket_path, tmp_path):
+        """Test that errors from the daemon surface to the caller."""
+        with pytest.raises(RuntimeError, match="not found"):
+            daemon.request_scan("text", str(tmp_path / "missing.json"), [], socket_path)
+
+    def test_no_daemon_returns_none(self, socket_path):
+        """Test that callers get None, and so scan in-process, when nothing is listening."""
+        assert daemon.request_scan("text", "fha_rules.json", [], socket_path + ".missing") is None
+
+    def test_socket_is_owner_only(self, socket_path):
+        """Test that the socket is created without group or other access."""
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    def test_edited_rules_file_is_reloaded(self, socket_path, tmp_path):
+        """Test that the daemon rebuilds its auditor once the rules file changes."""
+        rule = {"id": "T-1", "category": "Familial Status", "trigger_words": ["no kids"],
+                "severity": "Critical", "legal_basis": "FHA", "suggestion": "Remove it."}
+        rules = tmp_path / "rules.json"
+        rules.write_text(json.dumps([rule]), encoding="utf-8")
+        assert daemon.request_scan("No kids, no pets.", str(rules), [], socket_path)["flagged_items"]
+
+        rules.write_text(json.dumps([{**rule, "trigger_words": ["adults only"]}]), encoding="utf-8")
+        mtime_ns = os.stat(rules).st_mtime_ns + 1_000_000_000
+        os.utime(rules, ns=(mtime_ns, mtime_ns))
+        assert not daemon.request_scan("No kids, no pets.", str(rules), [], socket_path)["flagged_items"]
+
+    def test_socket_of_other_user_is_ignored(self, socket_path, monkeypatch):
+        """Test that a socket owned by another uid is never trusted for verdicts."""
+        real_lstat = os.lstat
+        info = list(real_lstat(socket_path))
+        info[4] += 1  # st_uid
+        foreign = os.stat_result(info)
+        monkeypatch.setattr(daemon.os, "lstat", lambda path: foreign if path == socket_path else real_lstat(path))
+
+        assert not daemon.daemon_running(socket_path)
+        assert daemon.request_scan("No kids allowed.", "fha_rules.json", [], socket_path) is None
+
+    def test_serve_refuses_path_it_does_not_own(self, tmp_path):
+        """Test that the daemon won't start on a path that isn't its own socket."""
+        path = tmp_path / "fairprop.sock"
+        path.write_text("not a socket")
+
+        with pytest.raises(PermissionError):
+            asyncio.run(daemon.ScanServer().serve(str(path)))
+        assert path.exists()
+
+    def test_default_path_in_private_dir(self, tmp_path, monkeypatch):
+        """Test that without $XDG_RUNTIME_DIR the socket goes in a 0700 per-user directory."""
+        monkeypatch.delenv("FAIRPROP_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(daemon.tempfile, "gettempdir", lambda: str(tmp_path))
+        path = daemon.default_socket_path()
+        assert os.path.dirname(path) == str(tmp_path / f"fairprop-{os.getuid()}")
+
+        daemon._prepare_socket_path(path)
+        assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
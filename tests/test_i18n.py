@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+
+import pytest
+from fairprop import i18n as i18n_module
+from fairprop.i18n import I18n
+
+
+@pytest.fixture
+def translations_dir(tmp_path):
+    (tmp_path / "es.json").write_text(json.dumps({
+        "ui": {"scan_button": "Escanear", "greeting": "Hola {name}", "nested": {"deep": "Profundo"}},
+        "categories": {"familial_status": "Estado familiar"},
+        "suggestions": {"FHA-FAM-001": "Describa la propiedad."}
+    }), encoding="utf-8")
+    return str(tmp_path)
+
+
+class TestTranslate:
+    """Test key lookup and formatting."""
+
+    def test_nested_keys(self, translations_dir):
+        """Test that dotted keys reach nested translations at any depth."""
+        i18n = I18n("es", translations_dir)
+
+        assert i18n.t("ui.scan_button") == "Escanear"
+        assert i18n.t("ui.nested.deep") == "Profundo"
+        assert i18n.t("ui.greeting", name="Ana") == "Hola Ana"
+
+    def test_sections_are_returned_whole(self, translations_dir):
+        """Test that a key naming a section returns the section, as before flattening."""
+        i18n = I18n("es", translations_dir)
+
+        assert i18n.t("categories") == {"familial_status": "Estado familiar"}
+
+    def test_translate_rule(self, translations_dir):
+        """Test that a rule's category and suggestion are translated on a copy."""
+        i18n = I18n("es", translations_dir)
+        rule = {"id": "FHA-FAM-001", "category": "Familial Status", "suggestion": "Describe the property."}
+        other = {"id": "FHA-FAM-002", "category": "Familial Status", "suggestion": "Remove it."}
+
+        assert i18n.translate_rule(rule) == {
+            "id": "FHA-FAM-001", "category": "Estado familiar", "suggestion": "Describa la propiedad."
+        }
+        assert i18n.translate_rule(other)["suggestion"] == "Remove it."
+        assert rule["category"] == "Familial Status"
+
+    def test_missing_keys_fall_back(self, translations_dir):
+        """Test that unknown keys, including ones below a leaf, return the default or the key."""
+        i18n = I18n("es", translations_dir)
+
+        assert i18n.t("ui.missing", default="Missing") == "Missing"
+        assert i18n.t("ui.scan_button.extra") == "ui.scan_button.extra"
+        assert I18n("nl", translations_dir).t("ui.scan_button") == "ui.scan_button"
+
+    def test_file_read_on_first_lookup(self, translations_dir, monkeypatch):
+        """Test that translations are parsed lazily, once, and again after a language change."""
+        reads = []
+        read = I18n._read_translations
+
+        def counting(self):
+            reads.append(self.language)
+            return read(self)
+
+        monkeypatch.setattr(I18n, "_read_translations", counting)
+        i18n = I18n("es", translations_dir)
+        assert reads == []
+
+        assert i18n.t("ui.scan_button") == "Escanear"
+        assert i18n.get_ui_messages()["scan_button"] == "Escanear"
+        assert reads == ["es"]
+
+        i18n.set_language("de")
+        assert i18n.t("ui.scan_button") == "ui.scan_button"
+        assert reads == ["es", "de"]
+
+
+class TestShorthand:
+    """Test the module-level t() shorthand."""
+
+    def test_cache_follows_reloaded_translations(self, translations_dir, monkeypatch, request):
+        """Test that cached lookups are dropped when translations are reloaded."""
+        request.addfinalizer(i18n_module._t_cached.cache_clear)
+        shutil.copy(os.path.join(translations_dir, "es.json"), os.path.join(translations_dir, "en.json"))
+        english = I18n("en", translations_dir)
+        monkeypatch.setattr(i18n_module, "_i18n_instance", english)
+
+        assert i18n_module.t("ui.scan_button") == "Escanear"
+        assert i18n_module.t("ui.greeting", name="Ana") == "Hola Ana"
+
+        english.translations_dir = english.translations_dir / "missing"
+        english._load_translations()
+        assert i18n_module.t("ui.scan_button", "Scan") == "Scan"
+        assert i18n_module.t("ui.scan_button") == "ui.scan_button"
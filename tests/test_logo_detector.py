@@ -0,0 +1,190 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from fairprop import logo_detector
+from fairprop.logo_detector import LogoDetector
+
+
+def _logo():
+    logo = np.zeros((80, 80), np.uint8)
+    cv2.circle(logo, (40, 40), 30, 255, 4)
+    cv2.rectangle(logo, (20, 25), (60, 55), 180, -1)
+    cv2.putText(logo, "EHO", (18, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 30, 2)
+    return logo
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = str(tmp_path / "template.png")
+    cv2.imwrite(path, _logo())
+    return path
+
+
+@pytest.fixture
+def detector(template_path):
+    return LogoDetector(template_path=template_path)
+
+
+def _photo(seed=0):
+    rng = np.random.default_rng(seed)
+    img = rng.normal(128, 40, (600, 800)).clip(0, 255).astype(np.uint8)
+    return cv2.GaussianBlur(img, (5, 5), 0)
+
+
+def _photo_with_logo(scale, top_left):
+    img = _photo()
+    logo = cv2.resize(_logo(), None, fx=scale, fy=scale)
+    x, y = top_left
+    img[y:y + logo.shape[0], x:x + logo.shape[1]] = logo
+    return img
+
+
+class TestMultiScaleDetection:
+    """Test coarse-to-fine multi-scale logo detection."""
+
+    @pytest.mark.parametrize("scale", [0.5, 1.0, 2.0])
+    def test_matches_exhaustive_search(self, detector, scale):
+        """Test that the pyramid search finds the same location and score as a full search."""
+        img = _photo_with_logo(scale, (311, 207))
+        template = cv2.resize(detector.template, None, fx=scale, fy=scale)
+        _, expected, _, expected_loc = cv2.minMaxLoc(cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED))
+
+        result = detector.detect_logo_multi_scale(Image.fromarray(img))
+
+        assert result["found"]
+        assert result["location"]["scale"] == scale
+        assert result["location"]["top_left"] == expected_loc == (311, 207)
+        assert result["confidence"] == pytest.approx(expected)
+
+    def test_no_logo(self, detector):
+        """Test that a photo without the logo is not flagged."""
+        rng = np.random.default_rng(1)
+        img = rng.integers(0, 255, (300, 400), dtype=np.uint8)
+
+        result = detector.detect_logo_multi_scale(Image.fromarray(img))
+
+        assert not result["found"]
+        assert result["confidence"] < detector.threshold
+
+
+class TestSingleScaleDetection:
+    """Test single-scale logo detection and its coarse pre-pass."""
+
+    def _count_full_size_matches(self, monkeypatch, img):
+        calls = []
+        match_template = cv2.matchTemplate
+
+        def counting(image, *args):
+            calls.append(image.shape == img.shape)
+            return match_template(image, *args)
+
+        monkeypatch.setattr(logo_detector.cv2, "matchTemplate", counting)
+        return calls
+
+    def test_logo_found(self, detector, monkeypatch):
+        """Test that a visible logo passes the pre-pass and is located at full size."""
+        img = _photo_with_logo(1.0, (311, 207))
+        calls = self._count_full_size_matches(monkeypatch, img)
+
+        result = detector.detect_logo(Image.fromarray(img))
+
+        assert result["found"]
+        assert result["location"]["top_left"] == (311, 207)
+        assert calls == [False, True]
+
+    def test_clear_negative_skips_full_search(self, detector, monkeypatch):
+        """Test that an image far below threshold at the coarse level is rejected there."""
+        img = _photo()
+        calls = self._count_full_size_matches(monkeypatch, img)
+
+        result = detector.detect_logo(Image.fromarray(img))
+
+        assert not result["found"]
+        assert calls == [False]
+
+    def test_pre_pass_can_be_disabled(self, detector, monkeypatch):
+        """Test that reject_margin=None always runs the full-size search."""
+        img = _photo()
+        detector.reject_margin = None
+        calls = self._count_full_size_matches(monkeypatch, img)
+
+        assert not detector.detect_logo(Image.fromarray(img))["found"]
+        assert calls == [True]
+
+    def test_umat_path_matches_cpu(self, detector):
+        """Test that matching through UMats, as with OpenCL, gives the same result."""
+        img = Image.fromarray(_photo_with_logo(1.0, (311, 207)))
+        expected = detector.detect_logo(img)
+        detector._template_umat = cv2.UMat(detector.template)
+
+        assert detector.detect_logo(img) == expected
+
+
+class TestBatchDetection:
+    """Test detecting the logo across several images."""
+
+    @pytest.mark.parametrize("multi_scale", [False, True])
+    def test_batch_matches_one_by_one(self, detector, multi_scale):
+        """Test that batched results equal per-image results, in input order."""
+        images = [Image.fromarray(_photo_with_logo(1.0, (311, 207))), Image.fromarray(_photo(1)),
+                  Image.fromarray(_photo_with_logo(0.5, (40, 500)))]
+        detect = detector.detect_logo_multi_scale if multi_scale else detector.detect_logo
+
+        results = detector.detect_logo_batch(images, max_workers=3, multi_scale=multi_scale)
+
+        assert results == [detect(image) for image in images]
+        assert results[0]["found"] and not results[1]["found"]
+
+
+class TestNumpyFallback:
+    """Test detection without OpenCV."""
+
+    @pytest.mark.parametrize("multi_scale", [False, True])
+    def test_fallback_matches_opencv(self, template_path, tmp_path, monkeypatch, multi_scale):
+        """Test that the NumPy path finds the logo where OpenCV does, with the same score."""
+        image_path = str(tmp_path / "photo.png")
+        cv2.imwrite(image_path, _photo_with_logo(1.0 if not multi_scale else 0.75, (311, 207)))
+        expected = LogoDetector(template_path=template_path).detect_logo_batch([image_path], multi_scale=multi_scale)[0]
+
+        monkeypatch.setattr(logo_detector, "HAS_CV2", False)
+        result = LogoDetector(template_path=template_path).detect_logo_batch([image_path], multi_scale=multi_scale)[0]
+
+        assert result["found"] and expected["found"]
+        assert result["location"] == expected["location"]
+        assert result["confidence"] == pytest.approx(expected["confidence"], abs=1e-3)
+
+    def test_fallback_ncc_matches_opencv(self):
+        """Test the NumPy TM_CCOEFF_NORMED against OpenCV, including flat windows."""
+        img = _photo()[:120, :160].copy()
+        img[:40, :40] = 0
+        template = img[50:80, 60:100].copy()
+
+        expected = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED)
+
+        assert np.allclose(logo_detector._ncc(img, template), expected, atol=1e-3)
+
+
+class TestImageInputs:
+    """Test the image input forms detection accepts."""
+
+    def test_bytes_path_and_pil_agree(self, detector, tmp_path):
+        """Test that encoded bytes, a file path and a PIL Image give the same result."""
+        img = _photo_with_logo(1.0, (311, 207))
+        path = str(tmp_path / "photo.png")
+        cv2.imwrite(path, img)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        expected = detector.detect_logo(Image.fromarray(img))
+
+        assert expected["found"]
+        assert detector.detect_logo(data) == expected
+        assert detector.detect_logo(path) == expected
+        assert detector.detect_logo_multi_scale(data) == detector.detect_logo_multi_scale(path)
+
+    def test_undecodable_bytes(self, detector):
+        """Test that bytes that are not an image are reported, not raised."""
+        assert detector.detect_logo(b"not an image")["message"] == "Failed to load image"
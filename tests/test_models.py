@@ -0,0 +1,216 @@
+import os
+
+import pytest
+from fairprop import models
+from fairprop.models import ModelManager
+
+
+class TestEmbeddingCache:
+    """Test reuse of sentence embeddings across scans."""
+    
+    def _manager(self, calls):
+        manager = ModelManager()
+        manager._has_ai = True
+        
+        def embed(texts):
+            calls.append(list(texts))
+            return [[float(len(t))] for t in texts]
+        
+        manager._embedding_function = embed
+        return manager
+    
+    def test_embed_reuses_cached_sentences(self):
+        """Test that only unseen sentences are embedded, once each, in input order."""
+        calls = []
+        manager = self._manager(calls)
+        
+        assert manager.embed(["No smoking", "Pets welcome", "No smoking"]) == [[10.0], [12.0], [10.0]]
+        assert manager.embed(["Pets welcome", "Near the park"]) == [[12.0], [13.0]]
+        assert calls == [["No smoking", "Pets welcome"], ["Near the park"]]
+    
+    def test_trigger_embeddings_cached_on_disk(self, tmp_path, monkeypatch):
+        """Test that trigger embeddings are reused across managers and rebuilt when triggers change."""
+        if not models.HAS_NUMPY:
+            pytest.skip("numpy not installed")
+        monkeypatch.setenv("FAIRPROP_CACHE_DIR", str(tmp_path))
+        calls = []
+        
+        first = self._manager(calls)._trigger_embeddings(["no kids", "adults only"])
+        second = self._manager(calls)._trigger_embeddings(["no kids", "adults only"])
+        assert second.tolist() == first.tolist() == [[7.0], [11.0]]
+        assert calls == [["no kids", "adults only"]]
+        
+        self._manager(calls)._trigger_embeddings(["no kids"])
+        assert len(calls) == 2
+    
+    def test_embed_cache_is_bounded(self, monkeypatch):
+        """Test that the least recently used embeddings are evicted first."""
+        monkeypatch.setattr(models, "EMBEDDING_CACHE_SIZE", 2)
+        calls = []
+        manager = self._manager(calls)
+        
+        manager.embed(["a", "b"])
+        manager.embed(["a"])
+        manager.embed(["c"])
+        manager.embed(["a", "b"])
+        assert calls == [["a", "b"], ["c"], ["b"]]
+
+    def test_index_rules_ids_unique_for_repeated_rule_ids(self, tmp_path, monkeypatch):
+        """Test that triggers get distinct ids even when two rules share an id."""
+        monkeypatch.setenv("FAIRPROP_CACHE_DIR", str(tmp_path))
+        added = {}
+
+        class Collection:
+            def add(self, **kwargs):
+                added.update(kwargs)
+
+        manager = self._manager([])
+        manager._chroma_collection = Collection()
+        rule = {"id": "FHA-1", "category": "Familial Status", "severity": "High"}
+        manager._index_rules([
+            {**rule, "trigger_words": ["no kids", "adults only"]},
+            {**rule, "trigger_words": ["no kids"]},
+        ])
+
+        assert added["documents"] == ["no kids", "adults only", "no kids"]
+        assert added["ids"] == ["FHA-1-0", "FHA-1-1", "FHA-1-2"]
+        assert [m["trigger"] for m in added["metadatas"]] == added["documents"]
+
+    def test_collection_names_unique_across_resets(self, monkeypatch):
+        """Test that each collection built in a process gets a fresh name."""
+        names = []
+
+        class Client:
+            def create_collection(self, name, embedding_function):
+                names.append(name)
+                return object()
+
+        manager = self._manager([])
+        monkeypatch.setattr(type(manager), "chroma_client", property(lambda self: Client()))
+        monkeypatch.setattr(manager, "_index_rules", lambda rules: None)
+        manager.get_collection([])
+        manager.reset_collection()
+        manager.get_collection([])
+
+        assert len(set(names)) == 2
+        assert all(name.startswith(f"fha_rules_{os.getpid()}_") for name in names)
+
+
+class TestEnvironmentCheck:
+    """Test detection of the optional AI packages."""
+    
+    def test_packages_located_lazily_without_import(self, monkeypatch):
+        """Test that AI packages are only looked up, and only once has_ai is asked."""
+        looked_up = []
+        
+        def find_spec(name):
+            looked_up.append(name)
+            return None if name == "chromadb" else object()
+        
+        monkeypatch.setattr(models.importlib.util, "find_spec", find_spec)
+        manager = ModelManager()
+        assert looked_up == []
+        
+        assert manager.has_ai is False
+        assert manager.has_ai is False
+        assert looked_up == list(models.AI_PACKAGES)
+
+
+class TestTriggerMetadata:
+    """Test the column-stored trigger metadata."""
+    
+    def test_entries_built_from_owning_rule(self):
+        """Test that each trigger reads back as the metadata dict of its rule."""
+        rules = [
+            {"id": "A", "category": "Race", "severity": "High", "trigger_words": ["x", "y"]},
+            {"id": "B", "category": "Age", "severity": "Low", "trigger_words": ["z"]},
+        ]
+        documents, metadatas = ModelManager._rule_documents(rules)
+        
+        assert documents == ["x", "y", "z"]
+        assert len(metadatas) == 3
+        assert metadatas[2] == {"rule_id": "B", "category": "Age", "severity": "Low", "trigger": "z"}
+        assert [m["rule_id"] for m in metadatas] == metadatas.rule_ids() == ["A", "A", "B"]
+
+
+class TestGuardrailCache:
+    """Test batched, cached zero-shot classification."""
+    
+    def test_classify_batches_unseen_sentences(self):
+        """Test that unseen sentences are classified in one batched call and then reused."""
+        calls = []
+        manager = ModelManager()
+        manager._has_ai = True
+        
+        def guardrail(texts, labels, batch_size):
+            calls.append((list(texts), batch_size))
+            return [{"labels": list(labels), "scores": [len(t) / 100] * len(labels)} for t in texts]
+        
+        manager._guardrail_pipeline = guardrail
+        labels = ["restrictive", "welcoming"]
+        
+        first = manager.classify_intent(["Quiet building", "Near transit", "Quiet building"], labels)
+        assert [r["scores"][0] for r in first] == [0.14, 0.12, 0.14]
+        manager.classify_intent(["Near transit"], labels)
+        manager.classify_intent(["Near transit"], ["welcoming"])
+        assert calls == [(["Quiet building", "Near transit"], models.GUARDRAIL_BATCH_SIZE),
+                         (["Near transit"], models.GUARDRAIL_BATCH_SIZE)]
+
+
+@pytest.mark.skipif(not models.HAS_FAISS, reason="faiss not installed")
+class TestRuleIndex:
+    """Test in-process nearest-trigger search."""
+    
+    def test_search_returns_cosine_similarity(self):
+        """Test that unnormalized vectors are compared by cosine similarity."""
+        index = models.RuleIndex(
+            [[2.0, 0.0], [0.0, 3.0]], ["adults only", "no kids"],
+            [{"rule_id": "A"}, {"rule_id": "B"}]
+        )
+        (sim_a, meta_a, doc_a), (sim_b, meta_b, doc_b) = index.search([[5.0, 0.0], [1.0, 1.0]])
+        
+        assert (meta_a["rule_id"], doc_a) == ("A", "adults only") and sim_a == pytest.approx(1.0)
+        assert doc_b in ("adults only", "no kids") and sim_b == pytest.approx(2 ** -0.5)
+    
+    def test_quantized_search_is_close_to_exact(self):
+        """Test that 8-bit codes find the same triggers with nearly the same similarity."""
+        rng = models.np.random.default_rng(0)
+        vectors = rng.normal(size=(200, 32))
+        queries = vectors[:20] + rng.normal(scale=0.1, size=(20, 32))
+        documents = [f"t{i}" for i in range(200)]
+        metadatas = [{"rule_id": d} for d in documents]
+        
+        exact = models.RuleIndex(vectors, documents, metadatas).search(queries)
+        quantized = models.RuleIndex(vectors, documents, metadatas, quantized=True).search(queries)
+        assert [hit[2] for hit in quantized] == [hit[2] for hit in exact]
+        assert all(abs(q[0] - e[0]) < 0.02 for q, e in zip(quantized, exact))
+    
+    def test_search_drops_hits_below_threshold(self):
+        """Test that min_similarity leaves None where the closest trigger is not similar enough."""
+        index = models.RuleIndex([[1.0, 0.0]], ["adults only"], [{"rule_id": "A"}])
+        hit, miss = index.search([[1.0, 0.1], [1.0, 1.0]], min_similarity=0.9)
+        
+        assert hit[2] == "adults only" and miss is None
+    
+    def test_rule_index_persisted_on_disk(self, tmp_path, monkeypatch):
+        """Test that a second manager maps the stored index instead of rebuilding it."""
+        monkeypatch.setenv("FAIRPROP_CACHE_DIR", str(tmp_path))
+        rules = [{"id": "A", "category": "Test", "severity": "Warning", "trigger_words": ["adults only", "no kids"]}]
+        
+        def manager():
+            instance = ModelManager()
+            instance._has_ai = True
+            return instance
+        
+        first = manager()
+        monkeypatch.setattr(first, "_trigger_embeddings", lambda documents: [[1.0, 0.0], [0.0, 1.0]])
+        expected = first.get_rule_index(rules).search([[0.2, 1.0]])
+        
+        second = manager()
+        monkeypatch.setattr(second, "_trigger_embeddings", lambda documents: pytest.fail("rebuilt"))
+        assert second.get_rule_index(rules).search([[0.2, 1.0]]) == expected
+        assert expected[0][2] == "no kids"
+    
+    def test_empty_index(self):
+        """Test that an index without triggers finds nothing."""
+        assert models.RuleIndex([], [], []).search([[1.0, 0.0]]) == [None]